@@ -0,0 +1,208 @@
+import itertools
+import random
+import sys
+import time
+import tracemalloc
+
+from logic import *
+
+
+def clue():
+    """The knowledge base from clue.py."""
+    mustard = Symbol("ColMustard")
+    plum = Symbol("ProfPlum")
+    scarlet = Symbol("MsScarlet")
+    ballroom = Symbol("ballroom")
+    kitchen = Symbol("kitchen")
+    library = Symbol("library")
+    knife = Symbol("knife")
+    revolver = Symbol("revolver")
+    wrench = Symbol("wrench")
+    symbols = [mustard, plum, scarlet, ballroom, kitchen, library,
+               knife, revolver, wrench]
+
+    knowledge = And(
+        Or(mustard, plum, scarlet),
+        Or(ballroom, kitchen, library),
+        Or(knife, revolver, wrench),
+        Not(mustard), Not(kitchen), Not(revolver),
+        Or(Not(scarlet), Not(library), Not(wrench)),
+        Not(plum), Not(ballroom)
+    )
+    return knowledge, symbols
+
+
+def mastermind(size, seed=0):
+    """
+    A mastermind knowledge base like the one in mastermind.py, with
+    size colors and positions. For size 4 it is that puzzle exactly;
+    larger ones rule out random wrong guesses about a hidden answer.
+    """
+    colors = ["red", "blue", "green", "yellow"]
+    colors += [f"color{i}" for i in range(len(colors), size)]
+    colors = colors[:size]
+
+    def symbol(color, i):
+        return Symbol(f"{color}{i}")
+
+    symbols = [symbol(color, i) for i in range(size) for color in colors]
+    knowledge = []
+    for color in colors:
+        knowledge.append(Or(*[symbol(color, i) for i in range(size)]))
+    for color in colors:
+        for i in range(size):
+            for j in range(size):
+                if i != j:
+                    knowledge.append(Implication(
+                        symbol(color, i), Not(symbol(color, j))))
+    for i in range(size):
+        for c1 in colors:
+            for c2 in colors:
+                if c1 != c2:
+                    knowledge.append(Implication(
+                        symbol(c1, i), Not(symbol(c2, i))))
+
+    if size == 4:
+        guessed = [("red", 0), ("blue", 1), ("green", 2), ("yellow", 3)]
+        options = []
+        for right in [(0, 1), (0, 2), (0, 3), (1, 2), (1, 3), (2, 3)]:
+            options.append(And(*[
+                symbol(*guessed[g]) if g in right else Not(symbol(*guessed[g]))
+                for g in range(4)
+            ]))
+        knowledge.append(Or(*options))
+        knowledge.append(And(
+            Not(symbol("blue", 0)), Not(symbol("red", 1)),
+            Not(symbol("green", 2)), Not(symbol("yellow", 3))
+        ))
+    else:
+        random.seed(seed)
+        answer = colors[:]
+        random.shuffle(answer)
+        for i, color in enumerate(answer):
+            for other in random.sample(colors, size // 2 + 1):
+                if other != color:
+                    knowledge.append(Not(symbol(other, i)))
+    return And(*knowledge), symbols
+
+
+def random_3sat(count, ratio=3.5, seed=0):
+    """A random knowledge base of three-symbol disjunctions."""
+    random.seed(seed)
+    symbols = [Symbol(f"x{i}") for i in range(count)]
+    knowledge = []
+    for _ in range(int(count * ratio)):
+        knowledge.append(Or(*[
+            s if random.random() < 0.5 else Not(s)
+            for s in random.sample(symbols, 3)
+        ]))
+    return And(*knowledge), symbols
+
+
+def walk_check(knowledge, query):
+    """
+    The original model_check, evaluating the sentences' trees in each
+    model held as a dict.
+    """
+    symbols = sorted(set.union(knowledge.symbols(), query.symbols()))
+    for values in itertools.product([True, False], repeat=len(symbols)):
+        model = dict(zip(symbols, values))
+        if knowledge.evaluate(model) and not query.evaluate(model):
+            return False
+    return True
+
+
+def one_at_a_time(check, prepare=None):
+    """
+    Returns a function that asks check whether each symbol and its
+    negation is entailed, as clue.py does, after preparing the
+    knowledge if there's something to do first.
+    """
+    def ask(knowledge, symbols):
+        if prepare is not None:
+            knowledge = prepare(knowledge)
+        return [(check(knowledge, s), check(knowledge, Not(s)))
+                for s in symbols]
+    return ask
+
+
+def incremental(knowledge):
+    """The same knowledge, as a KnowledgeBase to ask it all at once."""
+    return KnowledgeBase(*knowledge.conjuncts)
+
+
+def all_at_once(knowledge, symbols):
+    """Answers the same questions with one call to query_all."""
+    answers = query_all(knowledge, symbols)
+    return [(answers[s] is True, answers[s] is False) for s in symbols]
+
+
+def measure(ask, knowledge, symbols):
+    """Returns ask's answers about symbols and the time it took."""
+    start = time.perf_counter()
+    answers = ask(knowledge, symbols)
+    return answers, time.perf_counter() - start
+
+
+def building(count, seed=0):
+    """
+    Builds a random knowledge base of count three-symbol disjunctions
+    over count // 4 symbols, reporting the time and memory it takes.
+    """
+    random.seed(seed)
+    tracemalloc.start()
+    start = time.perf_counter()
+    knowledge = And(*[
+        Or(*[
+            Symbol(f"x{random.randrange(count // 4)}")
+            if random.random() < 0.5
+            else Not(Symbol(f"x{random.randrange(count // 4)}"))
+            for _ in range(3)
+        ])
+        for _ in range(count)
+    ])
+    seconds = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"building {len(knowledge.conjuncts)} clauses: {seconds:.2f} s, "
+          f"{size / 2 ** 20:.1f} MiB")
+
+
+def main():
+    quick = "--quick" in sys.argv
+
+    cases = [("clue", clue()), ("mastermind 4", mastermind(4))]
+    sizes = [5, 6, 8] if quick else [5, 6, 8, 12]
+    cases += [(f"mastermind {n}", mastermind(n)) for n in sizes]
+    counts = [50, 100] if quick else [50, 100, 200]
+    cases += [(f"3-sat {n}", random_3sat(n)) for n in counts]
+
+    checks = [("tree walk", one_at_a_time(walk_check), 16),
+              ("model_check", one_at_a_time(model_check), 16),
+              ("truth table", one_at_a_time(truth_table_check), 25),
+              ("sat_check", one_at_a_time(sat_check), None),
+              ("incremental", one_at_a_time(sat_check, incremental), None),
+              ("query_all", all_at_once, None)]
+    print(f"{'knowledge base':<16}{'symbols':>8}"
+          + "".join(f"{name:>14}" for name, _, _ in checks))
+    for name, (knowledge, symbols) in cases:
+        expected = None
+        times = []
+        for check_name, ask, limit in checks:
+            if limit is not None and len(symbols) > limit:
+                times.append("-")
+                continue
+            answers, seconds = measure(ask, knowledge, symbols)
+            if expected is None:
+                expected = answers
+            elif answers != expected:
+                print(f"WARNING: {check_name} disagrees on {name}")
+            times.append(f"{seconds:.3f} s")
+        print(f"{name:<16}{len(symbols):>8}"
+              + "".join(f"{t:>14}" for t in times))
+
+    building(50000 if quick else 200000)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import random
+import sys
+import time
+
+from bench_logic import clue, mastermind
+from logic import *
+
+
+def exactly_one(symbols):
+    """Yields sentences saying exactly one of symbols is true."""
+    yield Or(*symbols)
+    for i, a in enumerate(symbols):
+        for b in symbols[i + 1:]:
+            yield Implication(a, Not(b))
+
+
+def permutations(size):
+    """Knowledge that symbol "i=j" is a permutation of range(size)."""
+    knowledge = []
+    for i in range(size):
+        knowledge.extend(exactly_one(
+            [Symbol(f"{i}={j}") for j in range(size)]))
+        knowledge.extend(exactly_one(
+            [Symbol(f"{j}={i}") for j in range(size)]))
+    return And(*knowledge)
+
+
+def chain(size):
+    """
+    Knowledge that each of size + 1 symbols implies the next, which has
+    a model for each place the symbols could start being true.
+    """
+    symbols = [Symbol(f"v{i}") for i in range(size + 1)]
+    return And(*[Implication(a, b) for a, b in zip(symbols, symbols[1:])])
+
+
+def sudoku(box, blanks, seed=0):
+    """
+    A Sudoku with box x box boxes as knowledge, symbol "r,c=v" meaning
+    row r, column c holds v, with all but blanks cells of a solved grid
+    given.
+    """
+    size = box * box
+    random.seed(seed)
+
+    def symbol(r, c, v):
+        return Symbol(f"{r},{c}={v}")
+
+    groups = []
+    for i in range(size):
+        groups.append([(i, c) for c in range(size)])
+        groups.append([(r, i) for r in range(size)])
+        top, left = box * (i // box), box * (i % box)
+        groups.append([(top + r, left + c)
+                       for r in range(box) for c in range(box)])
+
+    knowledge = []
+    cells = [(r, c) for r in range(size) for c in range(size)]
+    for r, c in cells:
+        knowledge.extend(exactly_one(
+            [symbol(r, c, v) for v in range(size)]))
+    for group in groups:
+        for v in range(size):
+            knowledge.extend(exactly_one(
+                [symbol(r, c, v) for r, c in group]))
+
+    # a solved grid, with its values relabelled at random
+    values = list(range(size))
+    random.shuffle(values)
+    for r, c in random.sample(cells, len(cells) - blanks):
+        v = values[(box * (r % box) + r // box + c) % size]
+        knowledge.append(symbol(r, c, v))
+    return And(*knowledge)
+
+
+def measure(name, knowledge, enumerate_all=True):
+    """Counts and then lists the models of knowledge, timing each."""
+    start = time.perf_counter()
+    count = count_models(knowledge)
+    counted = time.perf_counter() - start
+
+    listed = "-"
+    if enumerate_all:
+        start = time.perf_counter()
+        found = sum(1 for _ in iter_models(knowledge))
+        listed = f"{time.perf_counter() - start:.3f} s"
+        if found != count:
+            print(f"WARNING: iter_models found {found} models of {name}")
+
+    table = "-"
+    if len(knowledge.symbols()) <= 16:
+        start = time.perf_counter()
+        found = sum(1 for _ in truth_table_models(knowledge))
+        table = f"{time.perf_counter() - start:.3f} s"
+        if found != count:
+            print(f"WARNING: the truth table has {found} models of {name}")
+
+    print(f"{name:<22}{len(knowledge.symbols()):>8}{count:>24}"
+          f"{table:>14}{counted:>12.3f} s{listed:>14}")
+
+
+def main():
+    quick = "--quick" in sys.argv
+    print(f"{'knowledge base':<22}{'symbols':>8}{'models':>24}"
+          f"{'truth table':>14}{'count_models':>14}{'iter_models':>14}")
+    measure("clue", clue()[0])
+    measure("mastermind 4", mastermind(4)[0])
+    measure("mastermind 6", mastermind(6)[0])
+    measure("sudoku 4x4, empty", sudoku(2, 16))
+    measure("sudoku 9x9, 40 blank", sudoku(3, 40))
+    measure("chain of 300", chain(300))
+    if not quick:
+        measure("sudoku 9x9, 50 blank", sudoku(3, 50))
+        measure("permutations of 7", permutations(7))
+        measure("permutations of 8", permutations(8))
+        measure("chain of 1200", chain(1200))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from logic import *
+
+
+def random_formulas(count, symbols, seed=0):
+    """Yields count random rules of the kinds in this directory's puzzles."""
+    random.seed(seed)
+    names = [Symbol(f"x{i}") for i in range(symbols)]
+    for _ in range(count):
+        a, b, c = random.sample(names, 3)
+        kind = random.randrange(4)
+        if kind == 0:
+            yield Or(a, Not(b), c)
+        elif kind == 1:
+            yield Implication(a, Not(b))
+        elif kind == 2:
+            yield Biconditional(a, And(b, Not(c)))
+        else:
+            yield Not(And(a, Or(b, c)))
+
+
+def timed(label, function, memory=False):
+    """
+    Runs function, reporting its time, and if memory is set runs it
+    again to report the most memory it used too.
+    """
+    start = time.perf_counter()
+    result = function()
+    seconds = time.perf_counter() - start
+    peak = ""
+    if memory:
+        tracemalloc.start()
+        function()
+        peak = f"{tracemalloc.get_traced_memory()[1] / 2 ** 20:>10.1f} MiB"
+        tracemalloc.stop()
+    print(f"{label:<48}{seconds:>8.2f} s{peak}")
+    return result
+
+
+def main():
+    quick = "--quick" in sys.argv
+    formulas = 20000 if quick else 200000
+    clauses = 100000 if quick else 2000000
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "rules.txt")
+        rules = list(random_formulas(formulas, formulas // 10))
+        with open(path, "w") as file:
+            write_formulas(rules, file)
+
+        def parse_all():
+            with open(path) as file:
+                return And(*read_formulas(file))
+        knowledge = timed(f"parse {formulas} formulas", parse_all)
+        if knowledge is not And(*rules):
+            print("WARNING: the formulas read back differ")
+
+        # a big random 3-SAT instance, streamed back without keeping it
+        path = os.path.join(directory, "random.cnf")
+        random.seed(0)
+        cnf = CNF()
+        cnf.count = clauses // 2
+        cnf.clauses = [
+            [random.choice((-1, 1)) * random.randint(1, cnf.count)
+             for _ in range(3)]
+            for _ in range(clauses)
+        ]
+        with open(path, "w") as file:
+            timed(f"write {clauses} DIMACS clauses",
+                  lambda: write_dimacs(cnf, file))
+        del cnf
+
+        def count_clauses():
+            with open(path) as file:
+                return sum(1 for _ in read_dimacs(file))
+        found = timed(f"read {clauses} DIMACS clauses", count_clauses,
+                      memory=True)
+        if found != clauses:
+            print(f"WARNING: read {found} clauses back")
+
+        def solve():
+            with open(path) as file:
+                solver = Solver(itertools.islice(read_dimacs(file), 100000))
+            return solver.solve()
+        timed("read 100000 clauses into the solver and solve", solve)
+
+
+if __name__ == "__main__":
+    main()
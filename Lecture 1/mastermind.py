@@ -6,7 +6,7 @@ for i in range(4):
     for color in colors:
         symbols.append(Symbol(f"{color}{i}"))
 
-knowledge = And()
+knowledge = KnowledgeBase()
 
 # Each color has a position.
 for color in colors:
@@ -57,6 +57,7 @@ knowledge.add(And(
     Not(Symbol("yellow3"))
 ))
 
+answers = query_all(knowledge, symbols)
 for symbol in symbols:
-    if model_check(knowledge, symbol):
+    if answers[symbol]:
         print(symbol)
@@ -5,7 +5,7 @@ houses = ["Gryffindor", "Hufflepuff", "Ravenclaw", "Slytherin"]
 
 symbols = []
 
-knowledge = And()
+knowledge = KnowledgeBase()
 
 for person in people:
     for house in houses:
@@ -50,6 +50,7 @@ knowledge.add(
     Symbol("MinervaGryffindor")
 )
 
+answers = query_all(knowledge, symbols)
 for symbol in symbols:
-    if model_check(knowledge, symbol):
+    if answers[symbol]:
         print(symbol)
@@ -0,0 +1,65 @@
+import sys
+import time
+
+from util import Node, StackFrontier, QueueFrontier
+
+
+class ListQueueFrontier():
+    """
+    The original list-slicing queue, kept here only as a baseline.
+    """
+    def __init__(self):
+        self.frontier = []
+
+    def add(self, node):
+        self.frontier.append(node)
+
+    def contains_state(self, state):
+        return any(node.state == state for node in self.frontier)
+
+    def empty(self):
+        return len(self.frontier) == 0
+
+    def remove(self):
+        node = self.frontier[0]
+        self.frontier = self.frontier[1:]
+        return node
+
+
+def churn(frontier_class, size):
+    """
+    Pushes size nodes through a frontier the way a search does,
+    checking membership before each add, and returns operations per
+    second.
+    """
+    frontier = frontier_class()
+    start = time.perf_counter()
+    for state in range(size):
+        if not frontier.contains_state(state):
+            frontier.add(Node(state=state, parent=None, action=None))
+        # keep the frontier about half full while it drains
+        if state % 2:
+            frontier.remove()
+    while not frontier.empty():
+        frontier.remove()
+    elapsed = time.perf_counter() - start
+    return 3 * size / elapsed
+
+
+def main():
+    sizes = [int(n) for n in sys.argv[1:]] or [10 ** 5, 10 ** 6]
+    for size in sizes:
+        for frontier_class in [QueueFrontier, StackFrontier]:
+            rate = churn(frontier_class, size)
+            print(f"{frontier_class.__name__:>18} {size:>9} nodes: "
+                  f"{rate:>12,.0f} ops/s")
+
+    # the list version is quadratic, so only time it on a small frontier
+    size = 5000
+    rate = churn(ListQueueFrontier, size)
+    print(f"{ListQueueFrontier.__name__:>18} {size:>9} nodes: "
+          f"{rate:>12,.0f} ops/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import random
+import sys
+import tempfile
+import time
+
+import degrees
+import synthetic
+from landmarks import LandmarkIndex
+
+
+def main():
+    num_people = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+
+    with tempfile.TemporaryDirectory() as directory:
+        synthetic.write_csv(directory, num_people=num_people,
+                            num_movies=num_people // 5)
+        degrees.load_data(directory, compact=True)
+        graph = degrees.graph
+
+        start = time.perf_counter()
+        LandmarkIndex.load_or_build(directory, graph, count)
+        built = time.perf_counter() - start
+        start = time.perf_counter()
+        index = LandmarkIndex.load_or_build(directory, graph, count)
+        loaded = time.perf_counter() - start
+
+    print(f"synthetic ({num_people} people), {count} landmarks: "
+          f"built in {built:.2f} s, reloaded in {loaded * 1000:.1f} ms")
+
+    rng = random.Random(50)
+    cast = [p for p in graph.person_ids
+            if len(graph.movies_for(graph.person_index[p]))]
+    pairs = [(rng.choice(cast), rng.choice(cast)) for _ in range(100)]
+
+    start = time.perf_counter()
+    truth = []
+    for source, target in pairs:
+        path = graph.shortest_path(source, target)
+        truth.append(None if path is None else len(path))
+    bfs = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bounds = [index.bounds(source, target) for source, target in pairs]
+    bounded = time.perf_counter() - start
+    tight = sum(1 for b in bounds if b is not None and b[0] == b[1])
+
+    start = time.perf_counter()
+    exact = [index.distance(source, target, exact=True)
+             for source, target in pairs]
+    searched = time.perf_counter() - start
+
+    print(f"  {'bfs':>10}: {bfs / len(pairs) * 1e6:>10.1f} us/query")
+    print(f"  {'bounds':>10}: {bounded / len(pairs) * 1e6:>10.1f} us/query "
+          f"({tight} of {len(pairs)} exact)")
+    print(f"  {'exact':>10}: {searched / len(pairs) * 1e6:>10.1f} us/query")
+    for bound, distance in zip(bounds, truth):
+        if bound is None or distance is None:
+            if bound is not None and bound[1] is not None:
+                print("  WARNING: bounds given for a disconnected pair")
+            continue
+        lower, upper = bound
+        if distance < lower or (upper is not None and distance > upper):
+            print("  WARNING: bounds do not contain the true distance")
+            break
+    if exact != truth:
+        print("  WARNING: exact distances differ from breadth-first search")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import gc
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import degrees
+import synthetic
+
+
+def reset():
+    degrees.names, degrees.people, degrees.movies = {}, {}, {}
+    degrees.graph = None
+    gc.collect()
+
+
+def graph_bytes():
+    """
+    Returns the bytes spent on the star graph alone, leaving out
+    names, births and titles.
+    """
+    if degrees.graph is not None:
+        graph = degrees.graph
+        return (graph.nbytes() + sys.getsizeof(graph.person_index)
+                + sys.getsizeof(graph.movie_index)
+                + sys.getsizeof(graph.person_ids)
+                + sys.getsizeof(graph.movie_ids))
+    return (sum(sys.getsizeof(p["movies"]) for p in degrees.people.values())
+            + sum(sys.getsizeof(m["stars"]) for m in degrees.movies.values()))
+
+
+def measure(directory, options, pairs):
+    """
+    Loads directory in one representation and returns the memory it
+    holds in total, at its peak while loading and for the graph alone,
+    the load time and the total time to answer pairs.
+    """
+    # tracing allocations slows loading down, so time an untraced load
+    reset()
+    start = time.perf_counter()
+    degrees.load_data(directory, cache=False, **options)
+    loaded = time.perf_counter() - start
+
+    reset()
+    tracemalloc.start()
+    degrees.load_data(directory, cache=False, **options)
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    search = degrees.choose_search()
+    lengths = []
+    start = time.perf_counter()
+    for source, target in pairs:
+        path = search(source, target)
+        lengths.append(None if path is None else len(path))
+    searched = time.perf_counter() - start
+    return held, peak, graph_bytes(), loaded, searched, lengths
+
+
+def report(label, directory, pairs):
+    print(f"{label}: {len(pairs)} queries")
+    results = {}
+    for name, options in [("dicts", {}), ("compact", {"compact": True}),
+                          ("stream", {"stream": True})]:
+        held, peak, graph, loaded, searched, lengths = measure(
+            directory, options, pairs)
+        results[name] = lengths
+        print(f"  {name:>8}: {held / 2 ** 20:>8.1f} MiB held "
+              f"{peak / 2 ** 20:>8.1f} MiB peak "
+              f"{graph / 2 ** 20:>8.1f} MiB graph "
+              f"{loaded:>7.2f} s load {searched * 1000:>9.1f} ms search")
+    if len(set(map(tuple, results.values()))) > 1:
+        print("  WARNING: representations disagree on path lengths")
+
+
+def main():
+    degrees.load_data("small", cache=False)
+    cast = sorted(p for p in degrees.people if degrees.people[p]["movies"])
+    report("small", "small", [(s, t) for s in cast for t in cast])
+
+    num_people = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    with tempfile.TemporaryDirectory() as directory:
+        synthetic.write_csv(directory, num_people=num_people,
+                            num_movies=num_people // 5)
+        reset()
+        degrees.load_data(directory, cache=False)
+        pairs = synthetic.random_pairs(degrees.people, 20)
+        report(f"synthetic ({num_people} people)", directory, pairs)
+
+
+if __name__ == "__main__":
+    main()
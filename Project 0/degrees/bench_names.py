@@ -0,0 +1,55 @@
+import random
+import sys
+import time
+
+from namesearch import NameSearch
+
+FIRST = ["tom", "kevin", "emma", "chris", "mandy", "gary", "sally", "robin",
+         "jack", "demi", "bill", "valeria", "dustin", "cary", "gerald"]
+
+
+def typo(rng, name):
+    """
+    Returns name with one letter dropped, doubled or swapped.
+    """
+    i = rng.randrange(1, len(name) - 1)
+    kind = rng.randrange(3)
+    if kind == 0:
+        return name[:i] + name[i + 1:]
+    if kind == 1:
+        return name[:i] + name[i] + name[i:]
+    return name[:i - 1] + name[i] + name[i - 1] + name[i + 1:]
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    rng = random.Random(50)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    keys = set()
+    while len(keys) < size:
+        surname = "".join(rng.choice(letters)
+                          for _ in range(rng.randint(4, 9)))
+        keys.add(f"{rng.choice(FIRST)} {surname}")
+
+    start = time.perf_counter()
+    index = NameSearch(keys)
+    print(f"{size} names indexed in {time.perf_counter() - start:.2f} s")
+
+    queries = rng.sample(sorted(keys), 200)
+    for label, method, inputs in [
+            ("prefix", index.prefix, [q[:len(q) - 2] for q in queries]),
+            ("fuzzy", index.fuzzy, [typo(rng, q) for q in queries]),
+            ("search", index.search, [typo(rng, q) for q in queries])]:
+        start = time.perf_counter()
+        results = [method(query, 5) for query in inputs]
+        elapsed = time.perf_counter() - start
+        hits = 0
+        for query, result in zip(queries, results):
+            found = [r if isinstance(r, str) else r[0] for r in result]
+            hits += query in found
+        print(f"  {label:>7}: {elapsed / len(inputs) * 1000:.3f} ms/query, "
+              f"intended name in top 5 for {hits} of {len(inputs)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import sys
+import time
+
+import degrees
+import synthetic
+
+
+def measure(search, pairs):
+    """
+    Runs search over every pair, returning the number of people
+    expanded, the total wall time and the path lengths found.
+    """
+    expanded = 0
+    neighbors = degrees.neighbors_for_person
+
+    def counting_neighbors(person_id):
+        nonlocal expanded
+        expanded += 1
+        return neighbors(person_id)
+
+    degrees.neighbors_for_person = counting_neighbors
+    lengths = []
+    start = time.perf_counter()
+    try:
+        for source, target in pairs:
+            path = search(source, target)
+            lengths.append(None if path is None else len(path))
+    finally:
+        degrees.neighbors_for_person = neighbors
+    return expanded, time.perf_counter() - start, lengths
+
+
+def report(label, pairs):
+    print(f"{label}: {len(pairs)} queries")
+    results = {}
+    for name, search in [("bfs", degrees.shortest_path),
+                         ("bidirectional",
+                          degrees.bidirectional_shortest_path)]:
+        expanded, elapsed, lengths = measure(search, pairs)
+        results[name] = lengths
+        print(f"  {name:>14}: {expanded:>10} expanded "
+              f"{elapsed * 1000:>10.1f} ms")
+    if results["bfs"] != results["bidirectional"]:
+        print("  WARNING: searches disagree on path lengths")
+
+
+def main():
+    # the bundled small data set, every ordered pair of distinct people
+    degrees.load_data("small")
+    cast = sorted(p for p in degrees.people if degrees.people[p]["movies"])
+    pairs = [(s, t) for s in cast for t in cast if s != t]
+    report("small", pairs)
+
+    num_people = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    synthetic.generate(degrees.people, degrees.movies, degrees.names,
+                       num_people=num_people, num_movies=num_people // 5)
+    pairs = synthetic.random_pairs(degrees.people, 20)
+    report(f"synthetic ({num_people} people)", pairs)
+
+
+if __name__ == "__main__":
+    main()
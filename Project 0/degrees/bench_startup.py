@@ -0,0 +1,36 @@
+import os
+import sys
+import tempfile
+import time
+
+import degrees
+import snapshot
+import synthetic
+
+
+def timed_load(directory, compact):
+    degrees.names, degrees.people, degrees.movies = {}, {}, {}
+    start = time.perf_counter()
+    degrees.load_data(directory, compact=compact)
+    return time.perf_counter() - start
+
+
+def main():
+    num_people = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    with tempfile.TemporaryDirectory() as directory:
+        synthetic.write_csv(directory, num_people=num_people,
+                            num_movies=num_people // 3)
+        print(f"synthetic ({num_people} people)")
+        for name, compact in [("dicts", False), ("compact", True)]:
+            # the first load parses the CSV files and writes the snapshot
+            path = os.path.join(directory, snapshot.FILENAME)
+            if os.path.exists(path):
+                os.remove(path)
+            first = timed_load(directory, compact)
+            second = timed_load(directory, compact)
+            print(f"  {name:>8}: {first:>7.2f} s from CSV, "
+                  f"{second:>7.2f} s from snapshot")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+import degrees
+import synthetic
+
+
+def main():
+    num_people = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+
+    with tempfile.TemporaryDirectory() as directory:
+        synthetic.write_csv(directory, num_people=num_people,
+                            num_movies=num_people // 5)
+        degrees.load_data(directory, compact=True, cache=False)
+
+    # distinct sources so every query is its own search
+    rng = random.Random(50)
+    cast = [p for p in degrees.people if len(degrees.graph.movies_for(
+        degrees.graph.person_index[p]))]
+    queries = "".join(
+        f"Person {source},Person {rng.choice(cast)}\n"
+        for source in rng.sample(cast, 200))
+
+    print(f"synthetic ({num_people} people): 200 queries")
+    expected = None
+    baseline = None
+    for workers in range(1, max_workers + 1):
+        output = io.StringIO()
+        start = time.perf_counter()
+        degrees.run_batch(io.StringIO(queries), output,
+                          degrees.choose_search(), workers=workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        if expected is None:
+            expected = output.getvalue()
+        elif output.getvalue() != expected:
+            print("  WARNING: results differ from the single process run")
+        print(f"  {workers:>3} workers: {elapsed:>7.2f} s "
+              f"({200 / elapsed:>7.1f} queries/s, "
+              f"{baseline / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+
+
+class CompactGraph():
+    """
+    The star graph with person and movie IDs interned to contiguous
+    integers and both directions stored as offset + index arrays
+    (compressed sparse rows), so it costs a few bytes per edge instead
+    of a Python set entry per edge.
+    """
+
+    def __init__(self, person_ids, movie_ids, stars):
+        """
+        Builds the graph from the list of person IDs, the list of movie
+        IDs and an iterable of (person_id, movie_id) starring roles.
+        Roles naming an unknown person or movie are skipped.
+        """
+        self.person_ids = person_ids
+        self.movie_ids = movie_ids
+        self.person_index = {p: i for i, p in enumerate(person_ids)}
+        self.movie_index = {m: i for i, m in enumerate(movie_ids)}
+
+        star_people = array("i")
+        star_movies = array("i")
+        for person_id, movie_id in stars:
+            person = self.person_index.get(person_id)
+            movie = self.movie_index.get(movie_id)
+            if person is not None and movie is not None:
+                star_people.append(person)
+                star_movies.append(movie)
+
+        self.person_offsets, self.person_movies = _rows(
+            len(person_ids), star_people, star_movies)
+        self.movie_offsets, self.movie_stars = _rows(
+            len(movie_ids), star_movies, star_people)
+
+    @classmethod
+    def from_dicts(cls, people, movies):
+        """
+        Builds the graph from the people and movies dictionaries that
+        degrees.load_data fills in.
+        """
+        stars = (
+            (person_id, movie_id)
+            for movie_id in movies
+            for person_id in movies[movie_id]["stars"]
+        )
+        return cls(list(people), list(movies), stars)
+
+    @classmethod
+    def from_arrays(cls, person_ids, movie_ids, person_offsets,
+                    person_movies, movie_offsets, movie_stars):
+        """
+        Rebuilds a graph from the ID lists and the four row arrays of
+        an existing graph, for example as saved in a snapshot.
+        """
+        graph = cls.__new__(cls)
+        graph.person_ids = person_ids
+        graph.movie_ids = movie_ids
+        graph.person_index = {p: i for i, p in enumerate(person_ids)}
+        graph.movie_index = {m: i for i, m in enumerate(movie_ids)}
+        graph.person_offsets = person_offsets
+        graph.person_movies = person_movies
+        graph.movie_offsets = movie_offsets
+        graph.movie_stars = movie_stars
+        return graph
+
+    def arrays(self):
+        """
+        Returns the four row arrays by name.
+        """
+        return {
+            "person_offsets": self.person_offsets,
+            "person_movies": self.person_movies,
+            "movie_offsets": self.movie_offsets,
+            "movie_stars": self.movie_stars
+        }
+
+    def movies_for(self, person):
+        """
+        Returns the movie indexes a person index starred in.
+        """
+        return self.person_movies[
+            self.person_offsets[person]:self.person_offsets[person + 1]]
+
+    def stars_for(self, movie):
+        """
+        Returns the person indexes who starred in a movie index.
+        """
+        return self.movie_stars[
+            self.movie_offsets[movie]:self.movie_offsets[movie + 1]]
+
+    def shortest_path(self, source, target):
+        """
+        Returns the shortest list of (movie_id, person_id) pairs
+        that connect the source person_id to the target person_id.
+
+        If no possible path, returns None.
+        """
+        return self.shortest_paths(source, [target])[target]
+
+    def shortest_paths(self, source, targets):
+        """
+        Returns a dictionary mapping each person_id in targets to the
+        shortest list of (movie_id, person_id) pairs that connect the
+        source to them, or None if they aren't connected, from a single
+        search that stops once every target has been reached.
+        """
+        source_id = source
+        source = self.person_index[source_id]
+        remaining = {self.person_index[t] for t in targets}
+        remaining.discard(source)
+
+        person_offsets = self.person_offsets
+        person_movies = self.person_movies
+        movie_offsets = self.movie_offsets
+        movie_stars = self.movie_stars
+
+        # parent person and connecting movie for every person reached;
+        # a movie only needs expanding once, since its whole cast is
+        # reached the first time any of them is
+        parent = array("i", [-1]) * len(self.person_ids)
+        via = array("i", [-1]) * len(self.person_ids)
+        seen_movies = bytearray(len(self.movie_ids))
+        parent[source] = source
+
+        frontier = [source]
+        while frontier and remaining:
+            next_frontier = []
+            for person in frontier:
+                for i in range(person_offsets[person],
+                               person_offsets[person + 1]):
+                    movie = person_movies[i]
+                    if seen_movies[movie]:
+                        continue
+                    seen_movies[movie] = 1
+                    for j in range(movie_offsets[movie],
+                                   movie_offsets[movie + 1]):
+                        star = movie_stars[j]
+                        if parent[star] != -1:
+                            continue
+                        parent[star] = person
+                        via[star] = movie
+                        next_frontier.append(star)
+                        if star in remaining:
+                            remaining.discard(star)
+                            if not remaining:
+                                break
+                    if not remaining:
+                        break
+                if not remaining:
+                    break
+            frontier = next_frontier
+
+        paths = {}
+        for target_id in targets:
+            target = self.person_index[target_id]
+            if target == source:
+                paths[target_id] = []
+            elif parent[target] == -1:
+                paths[target_id] = None
+            else:
+                paths[target_id] = self._path(parent, via, source, target)
+        return paths
+
+    def _path(self, parent, via, source, target):
+        """
+        Follows parent pointers back from target and translates the
+        route into (movie_id, person_id) pairs.
+        """
+        path = []
+        person = target
+        while person != source:
+            path.append((self.movie_ids[via[person]],
+                         self.person_ids[person]))
+            person = parent[person]
+        path.reverse()
+        return path
+
+    def nbytes(self):
+        """
+        Returns the bytes held by the adjacency arrays.
+        """
+        return sum(a.itemsize * len(a) for a in self.arrays().values())
+
+
+def _rows(count, keys, values):
+    """
+    Groups values by key into offset and index arrays, where the
+    values for key k are index[offsets[k]:offsets[k + 1]].
+    """
+    offsets = array("i", [0]) * (count + 1)
+    for key in keys:
+        offsets[key + 1] += 1
+    for k in range(count):
+        offsets[k + 1] += offsets[k]
+
+    index = array("i", [0]) * len(values)
+    position = offsets[:-1]
+    for key, value in zip(keys, values):
+        index[position[key]] = value
+        position[key] += 1
+    return offsets, index
+
+
+class CompactRecords(Mapping):
+    """
+    A read-only stand-in for the people or movies dictionary that
+    keeps each field as one list and builds a record only when an ID
+    is looked up.
+    """
+
+    def __init__(self, ids, index, **columns):
+        self.ids = ids
+        self.index = index
+        self.columns = columns
+
+    def __getitem__(self, key):
+        i = self.index[key]
+        return {field: column[i] for field, column in self.columns.items()}
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class CompactNames(Mapping):
+    """
+    A read-only stand-in for the names dictionary, answering lookups by
+    binary search over lowercase names kept in sorted order.
+    """
+
+    def __init__(self, keys, people, person_ids):
+        """
+        keys is the sorted list of lowercase names, people holds the
+        person index for each entry in keys (a name shared by several
+        people appears once per person) and person_ids maps person
+        indexes back to IDs.
+        """
+        self.keys = keys
+        self.people = people
+        self.person_ids = person_ids
+
+    @staticmethod
+    def sorted_keys(names):
+        """
+        Returns the keys and people arrays for a list of names, one
+        per person index.
+        """
+        order = sorted(range(len(names)), key=lambda i: names[i].lower())
+        return [names[i].lower() for i in order], array("i", order)
+
+    def __getitem__(self, key):
+        start = bisect_left(self.keys, key)
+        end = bisect_right(self.keys, key, start)
+        if start == end:
+            raise KeyError(key)
+        return {self.person_ids[self.people[i]] for i in range(start, end)}
+
+    def __iter__(self):
+        previous = None
+        for key in self.keys:
+            if key != previous:
+                yield key
+            previous = key
+
+    def __len__(self):
+        return sum(1 for _ in self)
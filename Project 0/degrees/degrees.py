@@ -1,6 +1,15 @@
+import argparse
 import csv
+import json
+import multiprocessing
+import statistics
 import sys
+import time
 
+import snapshot
+import streaming
+from compact import CompactGraph, CompactNames, CompactRecords
+from namesearch import NameSearch
 from util import Node, StackFrontier, QueueFrontier
 
 # Maps names to a set of corresponding person_ids
@@ -12,20 +21,49 @@ people = {}
 # Maps movie_ids to a dictionary of: title, year, stars (a set of person_ids)
 movies = {}
 
+# CompactGraph of who starred in what, used in place of the movies and
+# stars sets above when data is loaded in compact mode
+graph = None
 
-def load_data(directory):
+# NameSearch over the keys of names, built the first time it is needed
+name_search = None
+
+
+def load_data(directory, compact=False, cache=True, stream=False):
     """
     Load data from CSV files into memory.
+
+    In compact mode the star graph is stored as a CompactGraph and the
+    people and movies dictionaries only hold names, births and titles.
+
+    With cache on, a binary snapshot of the CSV files is kept next to
+    them and loaded instead whenever the files haven't changed since.
+
+    With stream on, only IDs and the star graph are held in memory and
+    names, people and movies read their rows from the CSV files when
+    looked up. Snapshots are not used in this mode.
     """
+    global names, people, movies, graph, name_search
+    names, people, movies, graph = {}, {}, {}, None
+    name_search = None
+
+    if stream:
+        names, people, movies, graph = streaming.load(directory)
+        return
+
+    if cache and load_snapshot(directory, compact):
+        return
+
     # Load people
     with open(f"{directory}/people.csv") as f:
         reader = csv.DictReader(f)
         for row in reader:
             people[row["id"]] = {
                 "name": row["name"],
-                "birth": row["birth"],
-                "movies": set()
+                "birth": row["birth"]
             }
+            if not compact:
+                people[row["id"]]["movies"] = set()
             if row["name"].lower() not in names:
                 names[row["name"].lower()] = {row["id"]}
             else:
@@ -37,58 +75,384 @@ def load_data(directory):
         for row in reader:
             movies[row["id"]] = {
                 "title": row["title"],
-                "year": row["year"],
-                "stars": set()
+                "year": row["year"]
             }
+            if not compact:
+                movies[row["id"]]["stars"] = set()
 
     # Load stars
     with open(f"{directory}/stars.csv") as f:
         reader = csv.DictReader(f)
-        for row in reader:
-            try:
-                people[row["person_id"]]["movies"].add(row["movie_id"])
-                movies[row["movie_id"]]["stars"].add(row["person_id"])
-            except KeyError:
-                pass
+        if compact:
+            graph = CompactGraph(
+                list(people), list(movies),
+                ((row["person_id"], row["movie_id"]) for row in reader))
+        else:
+            for row in reader:
+                try:
+                    people[row["person_id"]]["movies"].add(row["movie_id"])
+                    movies[row["movie_id"]]["stars"].add(row["person_id"])
+                except KeyError:
+                    pass
+
+    if cache:
+        save_snapshot(directory, graph or CompactGraph.from_dicts(
+            people, movies))
+
+
+def save_snapshot(directory, star_graph):
+    """
+    Writes the loaded data to a snapshot in directory. A directory we
+    can't write to just means the next run parses the CSV files again.
+    """
+    person_ids = star_graph.person_ids
+    movie_ids = star_graph.movie_ids
+    person_names = [people[p]["name"] for p in person_ids]
+    name_keys, name_people = CompactNames.sorted_keys(person_names)
+    tables = {
+        "person_ids": person_ids,
+        "names": person_names,
+        "births": [people[p]["birth"] for p in person_ids],
+        "movie_ids": movie_ids,
+        "titles": [movies[m]["title"] for m in movie_ids],
+        "years": [movies[m]["year"] for m in movie_ids],
+        "name_keys": name_keys
+    }
+    arrays = star_graph.arrays()
+    arrays["name_people"] = name_people
+    try:
+        snapshot.save(directory, tables, arrays)
+    except OSError:
+        pass
+
+
+def load_snapshot(directory, compact):
+    """
+    Fills names, people, movies and, in compact mode, graph from the
+    snapshot in directory. Returns False if there is no usable snapshot.
+
+    In compact mode names, people and movies become read-only views
+    over the snapshot's tables rather than dictionaries, so nothing is
+    built per person until it is looked up.
+    """
+    global names, people, movies, graph
+
+    saved = snapshot.load(directory)
+    if saved is None:
+        return False
+    tables, arrays = saved
+    person_ids = tables["person_ids"]
+    movie_ids = tables["movie_ids"]
+    name_people = arrays.pop("name_people")
+    star_graph = CompactGraph.from_arrays(person_ids, movie_ids, **arrays)
+
+    if compact:
+        graph = star_graph
+        names = CompactNames(tables["name_keys"], name_people, person_ids)
+        people = CompactRecords(person_ids, graph.person_index,
+                                name=tables["names"], birth=tables["births"])
+        movies = CompactRecords(movie_ids, graph.movie_index,
+                                title=tables["titles"], year=tables["years"])
+        return True
+
+    for person, person_id in enumerate(person_ids):
+        name = tables["names"][person]
+        people[person_id] = {
+            "name": name,
+            "birth": tables["births"][person],
+            "movies": {movie_ids[m] for m in star_graph.movies_for(person)}
+        }
+        if name.lower() not in names:
+            names[name.lower()] = {person_id}
+        else:
+            names[name.lower()].add(person_id)
+    for movie, movie_id in enumerate(movie_ids):
+        movies[movie_id] = {
+            "title": tables["titles"][movie],
+            "year": tables["years"][movie],
+            "stars": {person_ids[p] for p in star_graph.stars_for(movie)}
+        }
+    return True
 
 
 def main():
-    if len(sys.argv) > 2:
-        sys.exit("Usage: python degrees.py [directory]")
-    directory = sys.argv[1] if len(sys.argv) == 2 else "large"
+    parser = argparse.ArgumentParser(
+        description="Find degrees of separation between two actors.")
+    parser.add_argument("directory", nargs="?", default="large")
+    parser.add_argument("--bidirectional", action="store_true",
+                        help="search from both people and meet in the middle")
+    parser.add_argument("--compact", action="store_true",
+                        help="store the star graph as compact integer arrays")
+    parser.add_argument("--no-cache", dest="cache", action="store_false",
+                        help="always parse the CSV files, ignoring snapshots")
+    parser.add_argument("--stream", action="store_true",
+                        help="keep only IDs and the star graph in memory, "
+                             "reading names and titles as needed")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="answer source,target name pairs from FILE "
+                             "(- for stdin) instead of prompting")
+    parser.add_argument("--format", choices=["csv", "json"], default="csv",
+                        help="output format for --batch results")
+    parser.add_argument("--workers", type=int, default=1, metavar="N",
+                        help="answer --batch queries in N processes")
+    parser.add_argument("--fuzzy", action="store_true",
+                        help="in --batch, fall back to the closest name "
+                             "when a name has no exact match")
+    args = parser.parse_args()
+    if (args.compact or args.stream) and args.bidirectional:
+        parser.error("--bidirectional is not available with --compact "
+                     "or --stream")
+
+    # keep stdout clean for results when running in a pipeline
+    log = sys.stderr if args.batch else sys.stdout
 
     # Load data from files into memory
-    print("Loading data...")
-    load_data(directory)
-    print("Data loaded.")
+    print("Loading data...", file=log)
+    load_data(args.directory, compact=args.compact, cache=args.cache,
+              stream=args.stream)
+    print("Data loaded.", file=log)
+
+    search = choose_search(args.bidirectional)
+    if args.batch:
+        if args.batch == "-":
+            run_batch(sys.stdin, sys.stdout, search, args.format,
+                      args.workers, args.fuzzy)
+        else:
+            with open(args.batch, newline="") as f:
+                run_batch(f, sys.stdout, search, args.format, args.workers,
+                          args.fuzzy)
+    else:
+        run_program(search)
 
-    run_program()
 
+def choose_search(bidirectional=False):
+    """
+    Returns the shortest path function matching the loaded data
+    and the requested search.
+    """
+    if graph is not None:
+        return graph.shortest_path
+    if bidirectional:
+        return bidirectional_shortest_path
+    return shortest_path
 
-def run_program():
-    source = person_id_for_name(input("Name: "))
-    if source is None:
-        print("Person not found. Try again.")
-        run_program()
-    target = person_id_for_name(input("Name: "))
-    if target is None:
-        print("Person not found. Try again.")
-        run_program()
 
-    path = shortest_path(source, target)
+def run_program(search):
+    while True:
+        source = person_id_for_name(input("Name: "))
+        if source is None:
+            print("Person not found. Try again.")
+            continue
+        target = person_id_for_name(input("Name: "))
+        if target is None:
+            print("Person not found. Try again.")
+            continue
 
+        path = search(source, target)
+
+        if path is None:
+            print("Not connected.")
+        else:
+            degrees = len(path)
+            print(f"{degrees} degrees of separation.")
+            path = [(None, source)] + path
+            for i in range(degrees):
+                person1 = people[path[i][1]]["name"]
+                person2 = people[path[i + 1][1]]["name"]
+                movie = movies[path[i + 1][0]]["title"]
+                print(f"{i + 1}: {person1} and {person2} starred in {movie}")
+
+
+def run_batch(queries, output, search, output_format="csv", workers=1,
+              fuzzy=False):
+    """
+    Answers every source,target name pair read from queries, writing
+    one result per pair to output as CSV or JSON lines, and reports
+    latency and throughput on stderr.
+
+    Queries that share a source are answered together by a single
+    search that stops once it has reached all of their targets. With
+    more than one worker, sources are shared out between that many
+    forked processes, which all see the already loaded data. With
+    fuzzy, a name with no exact match resolves to the closest name.
+    """
+    start = time.perf_counter()
+
+    # resolve each distinct name once, keeping queries in input order,
+    # allowing for spaces around the names as other tools often write
+    rows = ([field.strip() for field in row] for row in csv.reader(queries))
+    pairs = [row for row in rows if any(row)]
+    resolved = {}
+    for row in pairs:
+        for name in row[:2]:
+            if name not in resolved:
+                resolved[name] = resolve_name(name, fuzzy)
+
+    # group queries by source so one search serves all of its targets
+    groups = {}
+    for n, row in enumerate(pairs):
+        if len(row) != 2:
+            continue
+        source, target = resolved[row[0]], resolved[row[1]]
+        if source[0] is not None and target[0] is not None:
+            groups.setdefault(source[0], []).append(n)
+
+    tasks = [
+        (source, sorted({resolved[pairs[n][1]][0] for n in group}))
+        for source, group in groups.items()
+    ]
+    answers = {}
+    latencies = {}
+    for source, paths, elapsed in answer_groups(tasks, search, workers):
+        group = groups[source]
+        for n in group:
+            answers[n] = paths[resolved[pairs[n][1]][0]]
+            latencies[n] = elapsed / len(group)
+
+    writer = csv.writer(output)
+    if output_format == "csv":
+        writer.writerow(["source", "target", "degrees", "path", "error"])
+    for n, row in enumerate(pairs):
+        result = batch_result(row, resolved, answers.get(n))
+        if output_format == "json":
+            output.write(json.dumps(result) + "\n")
+        else:
+            path = result["path"]
+            writer.writerow([
+                result["source"], result["target"], result["degrees"],
+                " ".join(f"{m}:{p}" for m, p in path) if path else "",
+                result["error"] or ""
+            ])
+
+    total = time.perf_counter() - start
+    print(f"{len(pairs)} queries in {total:.3f} s "
+          f"({len(pairs) / total if total else 0:.1f} queries/s)",
+          file=sys.stderr)
+    if latencies:
+        ordered = sorted(latencies.values())
+        print(f"search latency per query: "
+              f"mean {statistics.mean(ordered) * 1000:.3f} ms, "
+              f"median {statistics.median(ordered) * 1000:.3f} ms, "
+              f"max {ordered[-1] * 1000:.3f} ms", file=sys.stderr)
+
+
+# Search used by forked batch workers, set before the pool starts
+_worker_search = None
+
+
+def answer_groups(tasks, search, workers=1):
+    """
+    Yields (source, paths, seconds) for each (source, targets) task,
+    where paths maps every target to its shortest path, using up to
+    workers processes.
+    """
+    global _worker_search
+
+    if workers > 1 and "fork" not in multiprocessing.get_all_start_methods():
+        print("--workers needs fork(); answering in one process",
+              file=sys.stderr)
+        workers = 1
+    if workers <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            yield answer_group(task, search)
+        return
+
+    # forked workers share the loaded data copy-on-write, so only the
+    # small task tuples and the resulting paths cross process lines
+    _worker_search = search
+    context = multiprocessing.get_context("fork")
+    chunksize = max(1, len(tasks) // (workers * 8))
+    with context.Pool(workers) as pool:
+        yield from pool.imap_unordered(_answer_in_worker, tasks, chunksize)
+
+
+def _answer_in_worker(task):
+    return answer_group(task, _worker_search)
+
+
+def answer_group(task, search):
+    """
+    Returns (source, paths, seconds) for a single (source, targets) task.
+    """
+    source, targets = task
+    start = time.perf_counter()
+    if len(targets) == 1:
+        paths = {targets[0]: search(source, targets[0])}
+    else:
+        paths = shortest_paths(source, targets)
+    return source, paths, time.perf_counter() - start
+
+
+def batch_result(row, resolved, path):
+    """
+    Returns the record written for one batch query.
+    """
+    result = {
+        "source": row[0],
+        "target": row[1] if len(row) > 1 else None,
+        "degrees": None,
+        "path": None,
+        "error": None
+    }
+    if len(row) != 2:
+        result["error"] = "expected source,target"
+        return result
+    for name in row:
+        if resolved[name][1] is not None:
+            result["error"] = f"{resolved[name][1]}: {name}"
+            return result
     if path is None:
-        print("Not connected.")
+        result["error"] = "not connected"
     else:
-        degrees = len(path)
-        print(f"{degrees} degrees of separation.")
-        path = [(None, source)] + path
-        for i in range(degrees):
-            person1 = people[path[i][1]]["name"]
-            person2 = people[path[i + 1][1]]["name"]
-            movie = movies[path[i + 1][0]]["title"]
-            print(f"{i + 1}: {person1} and {person2} starred in {movie}")
-    run_program()
+        result["degrees"] = len(path)
+        result["path"] = path
+    return result
+
+
+def resolve_name(name, fuzzy=False):
+    """
+    Returns (person_id, None) for a name that matches exactly one
+    person, or (None, reason) when it can't be resolved without asking.
+
+    With fuzzy, a name with no exact match stands for the most similar
+    known name, as long as that one is a clear winner.
+    """
+    person_ids = names.get(name.lower(), set())
+    if len(person_ids) == 0 and fuzzy:
+        candidates = get_name_search().search(name, 2)
+        if candidates and candidates[0][1] >= 0.5 and (
+                len(candidates) == 1 or candidates[0][1] > candidates[1][1]):
+            person_ids = names[candidates[0][0]]
+    if len(person_ids) == 0:
+        return None, "person not found"
+    if len(person_ids) > 1:
+        return None, "ambiguous name"
+    return next(iter(person_ids)), None
+
+
+def get_name_search():
+    """
+    Returns the NameSearch over every loaded name, building it on
+    first use.
+    """
+    global name_search
+    if name_search is None:
+        name_search = NameSearch(names)
+    return name_search
+
+
+def suggest_names(name, limit=5):
+    """
+    Returns up to limit names, as written in the data, that look like
+    what was meant by name.
+    """
+    suggestions = []
+    for key, score in get_name_search().search(name, limit):
+        if score < 0.3:
+            break
+        person_id = next(iter(names[key]))
+        suggestions.append(people[person_id]["name"])
+    return suggestions
 
 
 def shortest_path(source, target):
@@ -98,17 +462,14 @@ def shortest_path(source, target):
 
     If no possible path, returns None.
     """
+    if source == target:
+        return []
     # make sure that both of the actors are actually in movies
     if(len(people[source]["movies"]) == 0 or
        len(people[target]["movies"]) == 0):
         return None
     # create the original node based on user input
     start = Node(state=source, parent=None, action=None)
-    test = neighbors_for_person(start.state)
-    for i in test:
-        movie, actor = i
-        if(actor == 437):
-            print(movie)
 
     # create a queue to store the frontier
     frontier = QueueFrontier()
@@ -116,44 +477,32 @@ def shortest_path(source, target):
     # add the start node
     frontier.add(start)
 
-    # create two sets, one to store explored nodes, one for easy search
-    # set() for backtracking through parents
-    # list for just names to not double add actors to frontier
-    explored = set()
-    list_explored = []
+    # map every person reached to (parent person_id, movie_id), which
+    # doubles as the visited set and lets us walk straight back to source
+    parents = {source: None}
     # as long as the frontier isnt empty
     while(not frontier.empty()):
         # remove state from frontier
         focus_node = frontier.remove()
-        # add it to explored set and explored list
-        explored.add(focus_node)
-        list_explored.append(focus_node.state)
         # add neighbors to frontier
         for pair in neighbors_for_person(focus_node.state):
             # for each neighbor, extract movie and their name (id)
             movie, person = pair
-            # if it's the person we're looking for, print out sequence
+            # if it's the person we're looking for, follow the parents back
             if(person == target):
-                print("FOUND: Generating List")
-                # create a list to store the backtracking to source
-                return_list = [(movie, person)]
-                # as long as we're not at the source
-                while focus_node.parent is not None:
-                    # add that node
-                    return_list.append(
-                        (focus_node.action, focus_node.state))
-                    # find the parent node and move up the search tree
-                    for adult in explored:
-                        if(adult.state == focus_node.parent):
-                            focus_node = adult
-                            break
-                # reverse the list only if we didn't reverse the order
+                parents[person] = (focus_node.state, movie)
+                return_list = []
+                while parents[person] is not None:
+                    parent, movie = parents[person]
+                    return_list.append((movie, person))
+                    person = parent
+                # reverse so the list runs from source to target
                 return return_list[::-1]
 
-            # if the person is not our target, make sure they arent already in
-            # the frontier or the explored sets
-            elif(not frontier.contains_state(person) and person
-                 not in list_explored):
+            # if the person is not our target, make sure we haven't
+            # already reached them some other way
+            elif(person not in parents):
+                parents[person] = (focus_node.state, movie)
                 # create a node for them and add to frontier
                 node = Node(
                     state=person, parent=focus_node.state, action=movie)
@@ -162,6 +511,133 @@ def shortest_path(source, target):
     return None
 
 
+def shortest_paths(source, targets):
+    """
+    Returns a dictionary mapping each person in targets to the
+    shortest list of (movie_id, person_id) pairs that connect the
+    source to them, or None if they aren't connected, from a single
+    search that stops once every target has been reached.
+    """
+    if graph is not None:
+        return graph.shortest_paths(source, targets)
+
+    remaining = set(targets)
+    parents = {source: None}
+    frontier = QueueFrontier()
+    frontier.add(Node(state=source, parent=None, action=None))
+    remaining.discard(source)
+    while remaining and not frontier.empty():
+        focus_node = frontier.remove()
+        for movie, person in neighbors_for_person(focus_node.state):
+            if person not in parents:
+                parents[person] = (focus_node.state, movie)
+                remaining.discard(person)
+                frontier.add(Node(
+                    state=person, parent=focus_node.state, action=movie))
+
+    paths = {}
+    for target in targets:
+        if target not in parents:
+            paths[target] = None
+            continue
+        path = []
+        person = target
+        while parents[person] is not None:
+            parent, movie = parents[person]
+            path.append((movie, person))
+            person = parent
+        paths[target] = path[::-1]
+    return paths
+
+
+def bidirectional_shortest_path(source, target):
+    """
+    Returns the shortest list of (movie_id, person_id) pairs
+    that connect the source to the target, searching outward from
+    both people at once and always expanding the smaller frontier.
+
+    If no possible path, returns None.
+    """
+    if source == target:
+        return []
+    if(len(people[source]["movies"]) == 0 or
+       len(people[target]["movies"]) == 0):
+        return None
+
+    # each side maps a person to (next person towards its root, movie)
+    forward = {source: None}
+    backward = {target: None}
+    forward_frontier = [source]
+    backward_frontier = [target]
+
+    while forward_frontier and backward_frontier:
+        # grow whichever side has fewer people waiting to be expanded
+        if len(forward_frontier) <= len(backward_frontier):
+            frontier, parents, others = forward_frontier, forward, backward
+        else:
+            frontier, parents, others = backward_frontier, backward, forward
+
+        # expand one whole layer so every meeting point found is at
+        # the same depth on this side, then keep the shortest one
+        next_frontier = []
+        meeting = None
+        best = None
+        for person in frontier:
+            for movie, neighbor in neighbors_for_person(person):
+                if neighbor in parents:
+                    continue
+                parents[neighbor] = (person, movie)
+                next_frontier.append(neighbor)
+                if neighbor in others:
+                    length = _depth(others, neighbor)
+                    if best is None or length < best:
+                        meeting, best = neighbor, length
+
+        if meeting is not None:
+            return _join_paths(forward, backward, meeting)
+
+        if parents is forward:
+            forward_frontier = next_frontier
+        else:
+            backward_frontier = next_frontier
+
+    # one side ran out of people, so the two are not connected
+    return None
+
+
+def _depth(parents, person):
+    """
+    Returns how many steps separate a person from the root of
+    a parent map built by bidirectional_shortest_path.
+    """
+    depth = 0
+    while parents[person] is not None:
+        person = parents[person][0]
+        depth += 1
+    return depth
+
+
+def _join_paths(forward, backward, meeting):
+    """
+    Stitches the source half and the target half of a bidirectional
+    search together at the person where they met.
+    """
+    path = []
+    person = meeting
+    while forward[person] is not None:
+        parent, movie = forward[person]
+        path.append((movie, person))
+        person = parent
+    path.reverse()
+
+    person = meeting
+    while backward[person] is not None:
+        child, movie = backward[person]
+        path.append((movie, child))
+        person = child
+    return path
+
+
 def person_id_for_name(name):
     """
     Returns the IMDB id for a person's name,
@@ -169,6 +645,9 @@ def person_id_for_name(name):
     """
     person_ids = list(names.get(name.lower(), set()))
     if len(person_ids) == 0:
+        suggestions = suggest_names(name)
+        if suggestions:
+            print(f"Did you mean: {', '.join(suggestions)}?")
         return None
     elif len(person_ids) > 1:
         print(f"Which '{name}'?")
@@ -0,0 +1,274 @@
+import sys
+import time
+from array import array
+
+import snapshot
+
+FILENAME = "landmarks.bin"
+
+# Distances are stored as shorts, with this marking "unreachable"
+UNREACHABLE = -1
+
+
+class LandmarkIndex():
+    """
+    Breadth-first distances from a handful of well connected landmark
+    people to everyone in a CompactGraph.
+
+    By the triangle inequality, for any landmark L the separation of
+    two people s and t is at least |d(L, s) - d(L, t)| and at most
+    d(L, s) + d(L, t), so a pair of lookups per landmark bounds the
+    answer without searching at all.
+    """
+
+    def __init__(self, graph, landmarks, rows):
+        """
+        landmarks is a list of person indexes and rows holds, for each
+        landmark, an array of its distance to every person index.
+        """
+        self.graph = graph
+        self.landmarks = landmarks
+        self.rows = rows
+
+    @classmethod
+    def build(cls, graph, count=16):
+        """
+        Picks the count people with the most co-stars as landmarks
+        and runs a breadth-first search from each of them.
+        """
+        people = range(len(graph.person_ids))
+        landmarks = sorted(people, key=lambda p: _costars(graph, p),
+                           reverse=True)[:count]
+        rows = [_distances_from(graph, landmark) for landmark in landmarks]
+        return cls(graph, landmarks, rows)
+
+    @classmethod
+    def load_or_build(cls, directory, graph, count=16):
+        """
+        Returns the index saved alongside the data set in directory,
+        building and saving a new one if it is missing or stale.
+        """
+        saved = snapshot.load(directory, FILENAME)
+        if saved is not None:
+            tables, arrays = saved
+            landmarks = [graph.person_index[p] for p in tables["landmarks"]]
+            if len(landmarks) == count:
+                # one flat array on disk, one row per landmark in memory
+                size = len(graph.person_ids)
+                distances = arrays["distances"]
+                rows = [distances[i * size:(i + 1) * size]
+                        for i in range(count)]
+                return cls(graph, landmarks, rows)
+
+        index = cls.build(graph, count)
+        index.save(directory)
+        return index
+
+    def save(self, directory):
+        """
+        Writes the index next to the data set in directory.
+        """
+        landmarks = [self.graph.person_ids[p] for p in self.landmarks]
+        distances = array("h")
+        for row in self.rows:
+            distances.extend(row)
+        try:
+            snapshot.save(directory, {"landmarks": landmarks},
+                          {"distances": distances}, FILENAME)
+        except OSError:
+            pass
+
+    def bounds(self, source, target):
+        """
+        Returns (lower, upper) bounds on the degrees of separation
+        between two person_ids, where upper is None if no landmark
+        reaches them both. Returns None if they are known not to be
+        connected.
+        """
+        return self._bounds(self.graph.person_index[source],
+                            self.graph.person_index[target])
+
+    def _bounds(self, source, target):
+        if source == target:
+            return 0, 0
+        lower = 0
+        upper = None
+        for row in self.rows:
+            s = row[source]
+            t = row[target]
+            if s == UNREACHABLE and t == UNREACHABLE:
+                continue
+            if s == UNREACHABLE or t == UNREACHABLE:
+                # a landmark reaches one of them but not the other
+                return None
+            if s - t > lower:
+                lower = s - t
+            elif t - s > lower:
+                lower = t - s
+            if upper is None or s + t < upper:
+                upper = s + t
+        return max(lower, 1), upper
+
+    def _lower(self, person, target):
+        """
+        Returns a lower bound on the separation of two person indexes.
+        """
+        lower = 0
+        for row in self.rows:
+            difference = row[person] - row[target]
+            if difference < 0:
+                difference = -difference
+            if difference > lower:
+                lower = difference
+        return lower
+
+    def distance(self, source, target, exact=False):
+        """
+        Returns the degrees of separation between two person_ids, or
+        None if they aren't connected.
+
+        Without exact, returns the landmark upper bound, which is often
+        but not always the true distance. With exact, runs a
+        bidirectional search that skips anyone the landmark bounds show
+        can't lie on a path shorter than the best one known. If no
+        landmark reaches either person there is no bound, so either way
+        the search gives the answer.
+        """
+        source = self.graph.person_index[source]
+        target = self.graph.person_index[target]
+        bounds = self._bounds(source, target)
+        if bounds is None:
+            return None
+        lower, upper = bounds
+        if upper is not None and (not exact or lower == upper):
+            return upper
+        return self._search(source, target, upper)
+
+    def _search(self, source, target, best):
+        graph = self.graph
+        person_offsets = graph.person_offsets
+        person_movies = graph.person_movies
+        movie_offsets = graph.movie_offsets
+        movie_stars = graph.movie_stars
+
+        # distance from each side's root for everyone that side labels
+        forward = {source: 0}
+        backward = {target: 0}
+        forward_frontier = [source]
+        backward_frontier = [target]
+        forward_movies = bytearray(len(graph.movie_ids))
+        backward_movies = bytearray(len(graph.movie_ids))
+        forward_depth = backward_depth = 0
+        if best is None:
+            best = len(graph.person_ids)
+        found = False
+
+        # every path up to forward_depth + backward_depth long has been
+        # seen, so stop as soon as the next layer can't beat best
+        while (forward_frontier and backward_frontier and
+               forward_depth + backward_depth < best - 1):
+            if len(forward_frontier) <= len(backward_frontier):
+                frontier, labels, others = forward_frontier, forward, backward
+                seen_movies, depth, root = forward_movies, forward_depth, \
+                    target
+                forward_depth += 1
+            else:
+                frontier, labels, others = backward_frontier, backward, \
+                    forward
+                seen_movies, depth, root = backward_movies, backward_depth, \
+                    source
+                backward_depth += 1
+
+            next_frontier = []
+            for person in frontier:
+                for i in range(person_offsets[person],
+                               person_offsets[person + 1]):
+                    movie = person_movies[i]
+                    if seen_movies[movie]:
+                        continue
+                    seen_movies[movie] = 1
+                    for j in range(movie_offsets[movie],
+                                   movie_offsets[movie + 1]):
+                        star = movie_stars[j]
+                        if star in labels:
+                            continue
+                        labels[star] = depth + 1
+                        if star in others and depth + 1 + others[star] < best:
+                            best = depth + 1 + others[star]
+                            found = True
+                        # no use expanding someone who can't be on a
+                        # path shorter than the best one already known
+                        if depth + 1 + self._lower(star, root) < best:
+                            next_frontier.append(star)
+
+            if labels is forward:
+                forward_frontier = next_frontier
+            else:
+                backward_frontier = next_frontier
+
+        if found or best < len(graph.person_ids):
+            return best
+        return None
+
+
+def _costars(graph, person):
+    """
+    Returns how many starring roles a person's movies have in total,
+    a cheap stand-in for how many co-stars they have.
+    """
+    return sum(len(graph.stars_for(movie))
+               for movie in graph.movies_for(person))
+
+
+def _distances_from(graph, landmark):
+    """
+    Returns an array of the breadth-first distance from a person index
+    to every person index, or UNREACHABLE.
+    """
+    person_offsets = graph.person_offsets
+    person_movies = graph.person_movies
+    movie_offsets = graph.movie_offsets
+    movie_stars = graph.movie_stars
+
+    distances = array("h", [UNREACHABLE]) * len(graph.person_ids)
+    seen_movies = bytearray(len(graph.movie_ids))
+    distances[landmark] = 0
+    frontier = [landmark]
+    depth = 0
+    while frontier:
+        depth += 1
+        next_frontier = []
+        for person in frontier:
+            for i in range(person_offsets[person], person_offsets[person + 1]):
+                movie = person_movies[i]
+                if seen_movies[movie]:
+                    continue
+                seen_movies[movie] = 1
+                for j in range(movie_offsets[movie], movie_offsets[movie + 1]):
+                    star = movie_stars[j]
+                    if distances[star] == UNREACHABLE:
+                        distances[star] = depth
+                        next_frontier.append(star)
+        frontier = next_frontier
+    return distances
+
+
+def main():
+    import degrees
+
+    if len(sys.argv) not in [2, 3]:
+        sys.exit("Usage: python landmarks.py directory [count]")
+    directory = sys.argv[1]
+    count = int(sys.argv[2]) if len(sys.argv) == 3 else 16
+
+    print("Loading data...")
+    degrees.load_data(directory, compact=True)
+    print("Building landmark index...")
+    start = time.perf_counter()
+    index = LandmarkIndex.load_or_build(directory, degrees.graph, count)
+    print(f"{len(index.landmarks)} landmarks ready in "
+          f"{time.perf_counter() - start:.2f} s.")
+
+
+if __name__ == "__main__":
+    main()
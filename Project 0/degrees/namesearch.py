@@ -0,0 +1,112 @@
+from array import array
+from bisect import bisect_left
+from collections import Counter
+
+# Posting lists longer than this are only used when a query has no rarer
+# trigrams, since counting them costs more than they add to the ranking
+COMMON = 2000
+
+
+class NameSearch():
+    """
+    Finds names by prefix, with a binary search over the sorted names,
+    and by similarity, with an index from each three letter run
+    (trigram) to the names containing it.
+    """
+
+    def __init__(self, keys):
+        """
+        keys is an iterable of lowercase names.
+        """
+        self.keys = sorted(keys)
+        postings = {}
+        for i, key in enumerate(self.keys):
+            for trigram in set(_trigrams(key)):
+                if trigram not in postings:
+                    postings[trigram] = array("i")
+                postings[trigram].append(i)
+        self.postings = postings
+
+    def prefix(self, query, limit=10):
+        """
+        Returns up to limit names starting with query, shortest first.
+        """
+        query = query.lower()
+        matches = []
+        i = bisect_left(self.keys, query)
+        while i < len(self.keys) and len(matches) < limit * 10:
+            key = self.keys[i]
+            if not key.startswith(query):
+                break
+            matches.append(key)
+            i += 1
+        matches.sort(key=lambda key: (len(key), key))
+        return matches[:limit]
+
+    def fuzzy(self, query, limit=10):
+        """
+        Returns up to limit (name, score) pairs for the names sharing the
+        most trigrams with query, best first. Scores run from 0 to 1.
+        """
+        trigrams = set(_trigrams(query.lower()))
+        lists = sorted(
+            (self.postings[t] for t in trigrams if t in self.postings),
+            key=len)
+        if not lists:
+            return []
+
+        # count shared trigrams using the rare ones, which are the ones
+        # that tell names apart, and always at least two of them
+        counts = Counter()
+        for n, postings in enumerate(lists):
+            if n >= 2 and len(postings) > COMMON:
+                break
+            counts.update(postings)
+
+        ranked = []
+        for i, _ in counts.most_common(limit * 5):
+            key = self.keys[i]
+            ranked.append((key, _similarity(trigrams, key)))
+        ranked.sort(key=lambda pair: (-pair[1], pair[0]))
+        return ranked[:limit]
+
+    def search(self, query, limit=10):
+        """
+        Returns up to limit (name, score) candidates for query, with
+        exact and prefix matches ahead of similar names.
+        """
+        query = query.lower()
+        trigrams = set(_trigrams(query))
+        candidates = {}
+        for key in self.prefix(query, limit):
+            if key == query:
+                candidates[key] = 1.0
+            else:
+                # halfway to a perfect score for starting with query, and
+                # the rest for how close to it the name is, so the names
+                # query leaves the least off of come first
+                similarity = _similarity(trigrams, key)
+                candidates[key] = min(0.99, (1 + similarity) / 2)
+        for key, score in self.fuzzy(query, limit):
+            candidates.setdefault(key, score)
+        ranked = sorted(candidates.items(),
+                        key=lambda pair: (-pair[1], pair[0]))
+        return ranked[:limit]
+
+
+def _similarity(trigrams, key):
+    """
+    Returns how alike a name is to a query with the given set of
+    trigrams, from 0 to 1, as the Dice coefficient of their trigrams.
+    """
+    own = set(_trigrams(key))
+    return 2 * len(trigrams.intersection(own)) / (len(trigrams) + len(own))
+
+
+def _trigrams(key):
+    """
+    Returns the trigrams of a name, padded so the first and last
+    letters get trigrams of their own.
+    """
+    padded = f"  {key} "
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
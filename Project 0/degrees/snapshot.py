@@ -0,0 +1,125 @@
+import json
+import mmap
+import os
+import struct
+
+# Bump whenever the layout written by save changes
+VERSION = 2
+
+MAGIC = b"DEGREES\0"
+FILENAME = "snapshot.bin"
+SOURCES = ["people.csv", "movies.csv", "stars.csv"]
+
+
+def source_key(directory):
+    """
+    Returns the size and modification time of each CSV file, which
+    a snapshot must match to be used.
+    """
+    key = []
+    for name in SOURCES:
+        stat = os.stat(os.path.join(directory, name))
+        key.append([name, stat.st_size, stat.st_mtime_ns])
+    return key
+
+
+def save(directory, tables, arrays, filename=FILENAME):
+    """
+    Writes a snapshot of the CSV files in directory.
+
+    tables maps names to lists of strings and arrays maps names to
+    array objects. Each section is padded so that the arrays can be
+    memory mapped straight back in by load.
+    """
+    header = json.dumps({
+        "version": VERSION,
+        "key": source_key(directory),
+        "tables": list(tables),
+        "arrays": {name: values.typecode for name, values in arrays.items()}
+    }).encode()
+
+    path = os.path.join(directory, filename)
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        for strings in tables.values():
+            _write_section(f, "\0".join(strings).encode(), len(strings))
+        for values in arrays.values():
+            _write_section(f, values.tobytes(), len(values))
+    # replace in one step so a reader never sees half a snapshot
+    os.replace(temporary, path)
+
+
+def load(directory, filename=FILENAME):
+    """
+    Returns (tables, arrays) from the snapshot in directory, or None
+    if there is no snapshot or it no longer matches the CSV files.
+
+    Arrays come back as typed memoryviews over a memory mapping of
+    the file, so they are paged in only as they are used.
+    """
+    path = os.path.join(directory, filename)
+    try:
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    try:
+        return _parse(data, directory)
+    except (KeyError, ValueError, struct.error):
+        # a truncated or foreign file is treated like a stale one
+        return None
+
+
+def _parse(data, directory):
+    """
+    Reads the header and sections of a mapped snapshot file.
+    """
+    view = memoryview(data)
+    if bytes(view[:len(MAGIC)]) != MAGIC:
+        return None
+    position = len(MAGIC)
+    length, = struct.unpack_from("<Q", data, position)
+    position += 8
+    header = json.loads(bytes(view[position:position + length]))
+    position += length
+    if (header["version"] != VERSION or
+            header["key"] != source_key(directory)):
+        return None
+
+    tables = {}
+    for name in header["tables"]:
+        count, size, start = _read_section(data, position)
+        section = bytes(view[start:start + size])
+        tables[name] = section.decode().split("\0") if count else []
+        position = start + size
+
+    arrays = {}
+    for name, typecode in header["arrays"].items():
+        count, size, start = _read_section(data, position)
+        arrays[name] = view[start:start + size].cast(typecode)
+        position = start + size
+    return tables, arrays
+
+
+def _write_section(f, payload, count):
+    """
+    Writes one section: its item count and byte size, padding up to
+    an 8 byte boundary, then the payload itself.
+    """
+    f.write(struct.pack("<QQ", count, len(payload)))
+    f.write(b"\0" * (-f.tell() % 8))
+    f.write(payload)
+
+
+def _read_section(data, position):
+    """
+    Returns the item count, byte size and payload offset of the
+    section starting at position.
+    """
+    count, size = struct.unpack_from("<QQ", data, position)
+    position += 16
+    return count, size, position + (-position % 8)
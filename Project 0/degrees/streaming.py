@@ -0,0 +1,146 @@
+import csv
+from array import array
+from collections.abc import Mapping
+
+from compact import CompactGraph, CompactNames
+
+
+class LazyRecords(Mapping):
+    """
+    A read-only stand-in for the people or movies dictionary that only
+    remembers where each row starts in its CSV file, and reads and
+    parses the row when its ID is looked up.
+    """
+
+    def __init__(self, path, fields, ids, index, offsets):
+        self.path = path
+        self.fields = fields
+        self.ids = ids
+        self.index = index
+        self.offsets = offsets
+
+    def __getitem__(self, key):
+        offset = self.offsets[self.index[key]]
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            _, record = next(_records(f, offset))
+        row = next(csv.reader([record.decode()]))
+        # the ID column is implied by the key, so leave it out
+        return {
+            field: value
+            for field, value in zip(self.fields, row) if field != "id"
+        }
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class LazyNames(Mapping):
+    """
+    A read-only stand-in for the names dictionary that reads every name
+    from people.csv the first time any name is looked up, keeping only
+    a sorted CompactNames index of them.
+    """
+
+    def __init__(self, people):
+        self.people = people
+        self.index = None
+
+    def _names(self):
+        if self.index is None:
+            # split the rows the same way _scan_ids did, so that the
+            # names line up with the IDs it found
+            names = []
+            with open(self.people.path, "rb") as f:
+                header = f.readline()
+                fields = next(csv.reader([header.decode()]))
+                name_column = fields.index("name")
+                for _, record in _records(f, len(header)):
+                    if record.strip():
+                        row = next(csv.reader([record.decode()]))
+                        names.append(row[name_column])
+            keys, order = CompactNames.sorted_keys(names)
+            self.index = CompactNames(keys, order, self.people.ids)
+        return self.index
+
+    def __getitem__(self, key):
+        return self._names()[key]
+
+    def __iter__(self):
+        return iter(self._names())
+
+    def __len__(self):
+        return len(self._names())
+
+
+def load(directory):
+    """
+    Reads the data set in directory in one pass per file, keeping only
+    IDs, row offsets and the star graph. Returns (names, people, movies,
+    graph) where names, people and movies read from the CSV files
+    on demand.
+    """
+    person_ids, person_offsets, person_fields = _scan_ids(
+        f"{directory}/people.csv")
+    movie_ids, movie_offsets, movie_fields = _scan_ids(
+        f"{directory}/movies.csv")
+
+    with open(f"{directory}/stars.csv", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        person_column = header.index("person_id")
+        movie_column = header.index("movie_id")
+        graph = CompactGraph(
+            person_ids, movie_ids,
+            ((row[person_column], row[movie_column]) for row in reader))
+
+    people = LazyRecords(f"{directory}/people.csv", person_fields,
+                         person_ids, graph.person_index, person_offsets)
+    movies = LazyRecords(f"{directory}/movies.csv", movie_fields,
+                         movie_ids, graph.movie_index, movie_offsets)
+    return LazyNames(people), people, movies, graph
+
+
+def _scan_ids(path):
+    """
+    Returns the ID of every row in a CSV file, the byte offset each row
+    starts at and the header's field names.
+    """
+    ids = []
+    offsets = array("q")
+    with open(path, "rb") as f:
+        header = f.readline()
+        fields = next(csv.reader([header.decode()]))
+        id_column = fields.index("id")
+        for offset, record in _records(f, len(header)):
+            if record.strip():
+                if id_column == 0 and not record.startswith(b'"'):
+                    # the common case needs no full CSV parse
+                    row_id = record.split(b",", 1)[0].decode()
+                else:
+                    row_id = next(csv.reader([record.decode()]))[id_column]
+                ids.append(row_id)
+                offsets.append(offset)
+    return ids, offsets, fields
+
+
+def _records(f, offset):
+    """
+    Yields the byte offset and bytes of each row of a CSV file opened in
+    binary mode, starting at offset where f is now. A quoted field may
+    hold line breaks, so a row runs on until its quotes are balanced.
+    """
+    record = b""
+    for line in f:
+        if not record:
+            start = offset
+        record += line
+        offset += len(line)
+        if not record.count(b'"') % 2:
+            yield start, record
+            record = b""
+    if record:
+        yield start, record
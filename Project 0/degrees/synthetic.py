@@ -0,0 +1,68 @@
+import csv
+import os
+import random
+
+
+def generate(people, movies, names, num_people=100000, num_movies=20000,
+             cast_size=6, seed=50):
+    """
+    Fill the people, movies and names dictionaries (in the same shape
+    degrees.load_data builds) with a random cast graph, so searches can
+    be measured on something much larger than the bundled small data.
+    """
+    rng = random.Random(seed)
+    people.clear()
+    movies.clear()
+    names.clear()
+
+    for i in range(num_people):
+        person_id = str(i)
+        name = f"Person {i}"
+        people[person_id] = {"name": name, "birth": "", "movies": set()}
+        names[name.lower()] = {person_id}
+
+    for i in range(num_movies):
+        movie_id = str(i)
+        stars = set()
+        for _ in range(cast_size):
+            # favour low ids so a few people become well connected stars
+            stars.add(str(int(num_people * rng.random() ** 2)))
+        movies[movie_id] = {"title": f"Movie {i}", "year": "", "stars": stars}
+        for person_id in stars:
+            people[person_id]["movies"].add(movie_id)
+
+
+def random_pairs(people, count, seed=50):
+    """
+    Returns count random (source, target) pairs of people who have
+    at least one movie, so every query has a chance to connect.
+    """
+    rng = random.Random(seed)
+    cast = sorted(p for p in people if people[p]["movies"])
+    return [(rng.choice(cast), rng.choice(cast)) for _ in range(count)]
+
+
+def write_csv(directory, **options):
+    """
+    Writes a random cast graph as people.csv, movies.csv and stars.csv
+    in directory, laid out like the bundled data sets. Takes the same
+    options as generate.
+    """
+    people, movies, names = {}, {}, {}
+    generate(people, movies, names, **options)
+    with open(os.path.join(directory, "people.csv"), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "name", "birth"])
+        for person_id, person in people.items():
+            writer.writerow([person_id, person["name"], person["birth"]])
+    with open(os.path.join(directory, "movies.csv"), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "title", "year"])
+        for movie_id, movie in movies.items():
+            writer.writerow([movie_id, movie["title"], movie["year"]])
+    with open(os.path.join(directory, "stars.csv"), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["person_id", "movie_id"])
+        for movie_id, movie in movies.items():
+            for person_id in sorted(movie["stars"]):
+                writer.writerow([person_id, movie_id])
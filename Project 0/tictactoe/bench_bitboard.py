@@ -0,0 +1,55 @@
+import time
+
+import bitboard
+import tictactoe as ttt
+from bench_search import action_value, reachable_boards
+
+
+def count_tree(engine, board):
+    """
+    Returns how many boards there are in the full game tree below
+    board, walking it with only the engine's public functions.
+    """
+    if engine.terminal(board):
+        engine.utility(board)
+        return 1
+    return 1 + sum(count_tree(engine, engine.result(board, action))
+                   for action in engine.actions(board))
+
+
+def main():
+    print("full game tree enumeration")
+    counts = {}
+    for engine in [ttt, bitboard]:
+        start = time.perf_counter()
+        counts[engine.__name__] = count_tree(engine, engine.initial_state())
+        elapsed = time.perf_counter() - start
+        print(f"  {engine.__name__:>10}: {counts[engine.__name__]} boards "
+              f"in {elapsed:.2f} s")
+    if len(set(counts.values())) > 1:
+        print("  WARNING: the engines disagree on the size of the tree")
+
+    # every reachable position gets the same verdict from both engines
+    for board in reachable_boards():
+        bits = bitboard.from_board(board)
+        if (ttt.winner(board) != bitboard.winner(bits) or
+                ttt.terminal(board) != bitboard.terminal(bits) or
+                ttt.actions(board) != bitboard.actions(bits) or
+                bitboard.to_board(bits) != board):
+            print("  WARNING: the engines disagree on a position")
+            break
+        if not ttt.terminal(board):
+            action = bitboard.minimax(bits)
+            if (action_value(board, action) !=
+                    action_value(board, ttt.alphabeta(board))):
+                print("  WARNING: the bitboard search picked a worse move")
+                break
+
+    start = time.perf_counter()
+    bitboard.minimax(bitboard.initial_state())
+    print(f"bitboard alpha-beta from the empty board: "
+          f"{(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import time
+
+import tictactoe as ttt
+from bench_search import action_value, reachable_boards
+from book import OpeningBook
+
+
+def main():
+    start = time.perf_counter()
+    OpeningBook.generate()
+    print(f"solved every position in "
+          f"{(time.perf_counter() - start) * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    book = OpeningBook.load()
+    print(f"loaded the book in {(time.perf_counter() - start) * 1000:.3f} ms")
+
+    boards = [b for b in reachable_boards() if not ttt.terminal(b)]
+    start = time.perf_counter()
+    actions = [book.action(board) for board in boards]
+    elapsed = time.perf_counter() - start
+    print(f"{len(boards)} lookups, "
+          f"{elapsed / len(boards) * 1e6:.1f} us per lookup")
+
+    for board, action in zip(boards, actions):
+        if (book.value(board) != ttt.cached_value(board) or
+                action_value(board, action) != book.value(board)):
+            print("WARNING: the book disagrees with minimax")
+            break
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import sys
+import time
+
+import tictactoe as ttt
+from bench_search import action_value, reachable_boards
+from mnk import MNKGame
+
+
+def self_play(game, budget):
+    """
+    Plays one game of the engine against itself, reporting the slowest
+    move and the depths it reached.
+    """
+    board = game.initial_state()
+    times = []
+    depths = []
+    while not game.terminal(board):
+        start = time.perf_counter()
+        action = game.best_action(board, budget)
+        times.append(time.perf_counter() - start)
+        depths.append(game.depth)
+        board = game.result(board, action)
+    victor = game.winner(board) or "nobody"
+    print(f"  {game.m}x{game.n}, k={game.k}: {len(times)} moves, "
+          f"{victor} won, slowest move {max(times) * 1000:.0f} ms, "
+          f"depth {min(depths)} to {max(depths)}")
+
+
+def main():
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+
+    # on 3x3 the search runs to the end, so it must match minimax
+    game = MNKGame(3, 3, 3)
+    boards = [b for b in reachable_boards() if not ttt.terminal(b)]
+    start = time.perf_counter()
+    for board in boards:
+        action = game.best_action(board, budget=60)
+        if action_value(board, action) != ttt.cached_value(board):
+            print("WARNING: the m,n,k engine missed the best 3x3 move")
+            break
+    print(f"3x3: {len(boards)} positions solved in "
+          f"{time.perf_counter() - start:.2f} s")
+
+    print(f"self-play with {budget} s per move")
+    for m, n, k in [(3, 3, 3), (4, 4, 4), (6, 6, 4), (15, 15, 5)]:
+        self_play(MNKGame(m, n, k), budget)
+
+
+if __name__ == "__main__":
+    main()
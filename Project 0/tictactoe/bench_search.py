@@ -0,0 +1,126 @@
+import sys
+import time
+
+import tictactoe as ttt
+
+
+def reachable_boards():
+    """
+    Returns every board that can come up in a game, each once.
+    """
+    start = ttt.initial_state()
+    seen = {encode(start): start}
+    stack = [start]
+    while stack:
+        board = stack.pop()
+        if ttt.terminal(board):
+            continue
+        for action in ttt.actions(board):
+            child = ttt.result(board, action)
+            if encode(child) not in seen:
+                seen[encode(child)] = child
+                stack.append(child)
+    return list(seen.values())
+
+
+def encode(board):
+    return tuple(cell for row in board for cell in row)
+
+
+def full_search(board):
+    """
+    Returns the value of the best action found by the plain minimax
+    search, for whichever player is to move.
+    """
+    if ttt.player(board) == ttt.X:
+        return max(ttt.min_value(ttt.result(board, action))
+                   for action in ttt.actions(board))
+    return min(ttt.max_value(ttt.result(board, action))
+               for action in ttt.actions(board))
+
+
+def action_value(board, action):
+    """
+    Returns the exact minimax value of making action on board.
+    """
+    child = ttt.result(board, action)
+    infinity = float("inf")
+    if ttt.player(board) == ttt.X:
+        return ttt.ab_min_value(child, -infinity, infinity)
+    return ttt.ab_max_value(child, -infinity, infinity)
+
+
+def count_nodes(names):
+    """
+    Wraps the named tictactoe functions so each call is counted,
+    returning the counter and a function that removes the wrappers.
+    """
+    counter = [0]
+    originals = {name: getattr(ttt, name) for name in names}
+
+    def wrap(function):
+        def counted(*args):
+            counter[0] += 1
+            return function(*args)
+        return counted
+
+    for name, function in originals.items():
+        setattr(ttt, name, wrap(function))
+
+    def restore():
+        for name, function in originals.items():
+            setattr(ttt, name, function)
+    return counter, restore
+
+
+def measure(label, search, node_functions, boards):
+    """
+    Runs search on every board, reporting nodes visited and time taken,
+    and returns what search returned for each board.
+    """
+    nodes = []
+    times = []
+    answers = []
+    for board in boards:
+        counter, restore = count_nodes(node_functions)
+        start = time.perf_counter()
+        try:
+            answers.append(search(board))
+        finally:
+            restore()
+        times.append(time.perf_counter() - start)
+        nodes.append(counter[0])
+    worst = max(range(len(boards)), key=lambda i: times[i])
+    print(f"  {label:>10}: {sum(nodes):>10} nodes {sum(times):>8.2f} s total, "
+          f"worst {nodes[worst]} nodes {times[worst] * 1000:.1f} ms")
+    return answers
+
+
+def main():
+    boards = [b for b in reachable_boards() if not ttt.terminal(b)]
+    print(f"{len(boards)} reachable positions with a move to make")
+    # the plain search takes most of a minute over every position
+    if "--quick" in sys.argv:
+        boards = boards[:200]
+    plain = measure("minimax", full_search, ["max_value", "min_value"],
+                    boards)
+    pruned = measure("alphabeta", ttt.alphabeta,
+                     ["ab_max_value", "ab_min_value"], boards)
+    values = [action_value(board, action)
+              for board, action in zip(boards, pruned)]
+    if values != plain:
+        print("  WARNING: alpha-beta picked a move worse than minimax")
+
+    # the first pass fills the transposition table, the second reuses it
+    ttt.transpositions.clear()
+    for label in ["cached", "cached again"]:
+        cached = measure(label, ttt.cached_minimax, ["cached_value"], boards)
+    print(f"  {len(ttt.transpositions)} distinct positions cached")
+    values = [action_value(board, action)
+              for board, action in zip(boards, cached)]
+    if values != plain:
+        print("  WARNING: the cached search picked a move worse than minimax")
+
+
+if __name__ == "__main__":
+    main()
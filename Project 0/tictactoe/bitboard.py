@@ -0,0 +1,185 @@
+"""
+Tic Tac Toe Player on bitboards
+
+The same functions as tictactoe.py, but a board is a pair of 9-bit
+integers (Xs, Os), with bit 3 * i + j set when square (i, j) is taken.
+"""
+
+import tictactoe as ttt
+
+X = ttt.X
+O = ttt.O
+EMPTY = ttt.EMPTY
+
+FULL = 0b111111111
+
+# One mask per way to get three in a row
+WIN_MASKS = [
+    0b000000111, 0b000111000, 0b111000000,
+    0b001001001, 0b010010010, 0b100100100,
+    0b100010001, 0b001010100
+]
+
+# Every 9-bit board that has three in a row somewhere
+WINNING = [any(bits & mask == mask for mask in WIN_MASKS)
+           for bits in range(FULL + 1)]
+
+# The (i, j) square of every bit, and the squares still free for every
+# 9-bit set of taken squares
+SQUARES = [(bit // 3, bit % 3) for bit in range(9)]
+FREE = [frozenset(SQUARES[bit] for bit in range(9) if not taken >> bit & 1)
+        for taken in range(FULL + 1)]
+
+# Square bits in the order the search tries them: center, corners, edges
+ORDER = [1 << (3 * i + j) for i, j in ttt.MOVE_ORDER]
+
+
+def initial_state():
+    """
+    Returns starting state of the board.
+    """
+    return (0, 0)
+
+
+def player(board):
+    """
+    Returns player who has the next turn on a board.
+    """
+    xs, os = board
+    if(bin(xs).count("1") > bin(os).count("1")):
+        return O
+    return X
+
+
+def actions(board):
+    """
+    Returns set of all possible actions (i, j) available on the board.
+    """
+    xs, os = board
+    return set(FREE[xs | os])
+
+
+def result(board, action):
+    """
+    Returns the board that results from making move (i, j) on the board.
+    """
+    xs, os = board
+    i, j = action
+    bit = 1 << (3 * i + j)
+    if((xs | os) & bit):
+        raise ValueError(f"square {action} is already taken")
+    if(player(board) == X):
+        return (xs | bit, os)
+    return (xs, os | bit)
+
+
+def winner(board):
+    """
+    Returns the winner of the game, if there is one.
+    """
+    xs, os = board
+    if(WINNING[xs]):
+        return X
+    if(WINNING[os]):
+        return O
+    return None
+
+
+def terminal(board):
+    """
+    Returns True if game is over, False otherwise.
+    """
+    xs, os = board
+    return WINNING[xs] or WINNING[os] or (xs | os) == FULL
+
+
+def utility(board):
+    """
+    Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+    """
+    xs, os = board
+    if(WINNING[xs]):
+        return 1
+    if(WINNING[os]):
+        return -1
+    return 0
+
+
+def minimax(board):
+    """
+    Returns the optimal action for the current player on the board.
+    """
+    if(terminal(board)):
+        return None
+
+    xs, os = board
+    moves = [SQUARES[bit.bit_length() - 1] for bit in ORDER
+             if not (xs | os) & bit]
+    alpha = -2
+    beta = 2
+    optimal_action = None
+    if(player(board) == X):
+        for action in moves:
+            v = _value(result(board, action), alpha, beta)
+            if(v > alpha):
+                alpha = v
+                optimal_action = action
+    else:
+        for action in moves:
+            v = _value(result(board, action), alpha, beta)
+            if(v < beta):
+                beta = v
+                optimal_action = action
+    return optimal_action
+
+
+def _value(board, alpha, beta):
+    """
+    Returns the minimax value of the board, searched with alpha-beta.
+    """
+    xs, os = board
+    if(WINNING[xs]):
+        return 1
+    if(WINNING[os]):
+        return -1
+    taken = xs | os
+    if(taken == FULL):
+        return 0
+
+    x_to_move = bin(xs).count("1") == bin(os).count("1")
+    v = -2 if x_to_move else 2
+    for bit in ORDER:
+        if(taken & bit):
+            continue
+        if(x_to_move):
+            v = max(v, _value((xs | bit, os), alpha, beta))
+            alpha = max(alpha, v)
+        else:
+            v = min(v, _value((xs, os | bit), alpha, beta))
+            beta = min(beta, v)
+        if(alpha >= beta):
+            break
+    return v
+
+
+def from_board(board):
+    """
+    Returns the bitboard for a tictactoe list-of-lists board.
+    """
+    xs = os = 0
+    for i in range(3):
+        for j in range(3):
+            if(board[i][j] == X):
+                xs |= 1 << (3 * i + j)
+            elif(board[i][j] == O):
+                os |= 1 << (3 * i + j)
+    return (xs, os)
+
+
+def to_board(board):
+    """
+    Returns the tictactoe list-of-lists board for a bitboard.
+    """
+    xs, os = board
+    return [[X if xs >> (3 * i + j) & 1 else O if os >> (3 * i + j) & 1
+             else EMPTY for j in range(3)] for i in range(3)]
@@ -0,0 +1,148 @@
+"""
+Tic Tac Toe opening book
+
+Every reachable position solved once and stored as one byte per
+possible arrangement of the 9 squares, so that finding the best move
+is a single lookup.
+"""
+
+import os
+import sys
+
+import bitboard
+import tictactoe as ttt
+
+FILENAME = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        "book.bin")
+
+# Each square counts for a power of 3 in a board's index
+POWERS = [3 ** square for square in range(9)]
+SIZE = 3 ** 9
+
+# Low nibble of an entry when there is no move to make
+NO_ACTION = 0x0F
+
+# Entry for a position that can't come up in a game
+UNREACHABLE = 0xFF
+
+
+class OpeningBook():
+    """
+    The best action and minimax value of every reachable position.
+
+    Entry index(board) holds the square (3 * i + j) of the best action
+    in its low four bits and the value plus one in the next two.
+    Unreachable positions hold UNREACHABLE.
+    """
+
+    def __init__(self, entries):
+        self.entries = entries
+
+    @classmethod
+    def generate(cls):
+        """
+        Solves every position reachable from the empty board.
+        """
+        entries = bytearray([UNREACHABLE]) * SIZE
+        solved = {}
+
+        def solve(board):
+            if board in solved:
+                return solved[board]
+            if bitboard.terminal(board):
+                value = bitboard.utility(board)
+                best = NO_ACTION
+            else:
+                maximizing = bitboard.player(board) == ttt.X
+                value = None
+                for action in ttt.MOVE_ORDER:
+                    if action not in bitboard.actions(board):
+                        continue
+                    child = solve(bitboard.result(board, action))
+                    # keep the first of equally good moves, so the book
+                    # prefers the center, then corners, then edges
+                    if (value is None or (maximizing and child > value) or
+                            (not maximizing and child < value)):
+                        value = child
+                        best = 3 * action[0] + action[1]
+            solved[board] = value
+            entries[_index(board)] = best | (value + 1) << 4
+            return value
+
+        solve(bitboard.initial_state())
+        return cls(entries)
+
+    @classmethod
+    def load(cls, filename=FILENAME):
+        """
+        Reads a book written by save.
+        """
+        with open(filename, "rb") as f:
+            entries = f.read()
+        if len(entries) != SIZE:
+            raise ValueError(f"{filename} is not an opening book")
+        return cls(entries)
+
+    @classmethod
+    def load_or_generate(cls, filename=FILENAME):
+        """
+        Reads the book from filename, or solves the game and writes
+        the book there if there isn't one yet.
+        """
+        try:
+            return cls.load(filename)
+        except (OSError, ValueError):
+            book = cls.generate()
+            try:
+                book.save(filename)
+            except OSError:
+                pass
+            return book
+
+    def save(self, filename=FILENAME):
+        with open(filename, "wb") as f:
+            f.write(self.entries)
+
+    def action(self, board):
+        """
+        Returns the optimal action for the current player on the board,
+        or None if the game is over.
+        """
+        square = self.entries[_index(bitboard.from_board(board))] & 0x0F
+        if square == NO_ACTION:
+            return None
+        return (square // 3, square % 3)
+
+    def value(self, board):
+        """
+        Returns 1 if X wins with best play from the board, -1 if O
+        does, 0 for a tie.
+        """
+        return (self.entries[_index(bitboard.from_board(board))] >> 4) - 1
+
+
+def _index(board):
+    """
+    Returns a bitboard's position in the book, reading each square as
+    a base 3 digit: 0 for empty, 1 for X, 2 for O.
+    """
+    xs, os = board
+    index = 0
+    for square in range(9):
+        if xs >> square & 1:
+            index += POWERS[square]
+        elif os >> square & 1:
+            index += 2 * POWERS[square]
+    return index
+
+
+def main():
+    filename = sys.argv[1] if len(sys.argv) > 1 else FILENAME
+    book = OpeningBook.generate()
+    book.save(filename)
+    reachable = sum(1 for entry in book.entries if entry != UNREACHABLE)
+    print(f"Solved {reachable} positions into {filename}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+m,n,k Player
+
+Tic Tac Toe generalized to an m by n board where k in a row wins, with
+the same functions as tictactoe.py. Boards too big to search to the end
+are played with iterative deepening alpha-beta, scored by a heuristic
+and stopped when the time budget for the move runs out.
+"""
+
+import time
+
+from tictactoe import EMPTY, O, X
+
+# Score of a won position, well clear of anything the heuristic returns
+WIN = 10 ** 9
+
+
+class Timeout(Exception):
+    pass
+
+
+class MNKGame():
+
+    def __init__(self, m=3, n=3, k=3):
+        """
+        Sets up a game on m rows of n squares where k in a row wins.
+        """
+        if k > max(m, n):
+            raise ValueError("k can't be longer than the board")
+        self.m = m
+        self.n = n
+        self.k = k
+
+        # every run of k squares in a line, as flat square indexes
+        self.windows = []
+        for i in range(m):
+            for j in range(n):
+                for di, dj in [(0, 1), (1, 0), (1, 1), (1, -1)]:
+                    end_i = i + di * (k - 1)
+                    end_j = j + dj * (k - 1)
+                    if 0 <= end_i < m and 0 <= end_j < n:
+                        self.windows.append(tuple(
+                            (i + di * s) * n + j + dj * s
+                            for s in range(k)))
+
+        # search squares near the center first
+        center_i = (m - 1) / 2
+        center_j = (n - 1) / 2
+        self.order = sorted(
+            range(m * n),
+            key=lambda s: abs(s // n - center_i) + abs(s % n - center_j))
+
+    def initial_state(self):
+        """
+        Returns starting state of the board.
+        """
+        return [[EMPTY] * self.n for _ in range(self.m)]
+
+    def player(self, board):
+        """
+        Returns player who has the next turn on a board.
+        """
+        cells = [cell for row in board for cell in row]
+        if cells.count(X) > cells.count(O):
+            return O
+        return X
+
+    def actions(self, board):
+        """
+        Returns set of all possible actions (i, j) available on the board.
+        """
+        return {(i, j) for i in range(self.m) for j in range(self.n)
+                if board[i][j] == EMPTY}
+
+    def result(self, board, action):
+        """
+        Returns the board that results from making move (i, j) on the board.
+        """
+        i, j = action
+        if board[i][j] != EMPTY:
+            raise ValueError(f"square {action} is already taken")
+        new_board = [row[:] for row in board]
+        new_board[i][j] = self.player(board)
+        return new_board
+
+    def winner(self, board):
+        """
+        Returns the winner of the game, if there is one.
+        """
+        cells = [cell for row in board for cell in row]
+        for window in self.windows:
+            first = cells[window[0]]
+            if first != EMPTY and all(cells[s] == first for s in window):
+                return first
+        return None
+
+    def terminal(self, board):
+        """
+        Returns True if game is over, False otherwise.
+        """
+        return (self.winner(board) is not None or
+                all(cell != EMPTY for row in board for cell in row))
+
+    def utility(self, board):
+        """
+        Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+        """
+        victor = self.winner(board)
+        if victor == X:
+            return 1
+        elif victor == O:
+            return -1
+        return 0
+
+    def best_action(self, board, budget=1.0):
+        """
+        Returns the best action found for the current player on the board
+        within budget seconds, or None if the game is over.
+
+        Searches one move deeper at a time and keeps the answer from the
+        deepest search that finished. The depth reached is left in
+        self.depth.
+        """
+        if self.terminal(board):
+            return None
+
+        deadline = time.perf_counter() + budget
+        cells = [cell for row in board for cell in row]
+        player = self.player(board)
+        empty = cells.count(EMPTY)
+        moves = self._candidates(cells)
+        best = moves[0]
+        self.depth = 0
+
+        for depth in range(1, empty + 1):
+            try:
+                score, move = self._root(cells, player, depth, moves,
+                                         deadline)
+            except Timeout:
+                break
+            best = move
+            self.depth = depth
+            # try the best move first in the next, deeper search
+            moves.remove(move)
+            moves.insert(0, move)
+            if abs(score) > WIN - empty - 1:
+                # the game is decided, searching deeper can't change it
+                break
+        return (best // self.n, best % self.n)
+
+    def _root(self, cells, player, depth, moves, deadline):
+        """
+        Returns (score, move) for the best of moves searched to depth.
+        """
+        opponent = O if player == X else X
+        alpha = -WIN - 1
+        best = moves[0]
+        for move in moves:
+            cells[move] = player
+            score = -self._negamax(cells, opponent, depth - 1, -WIN - 1,
+                                   -alpha, move, 1, deadline)
+            cells[move] = EMPTY
+            if score > alpha:
+                alpha = score
+                best = move
+        return alpha, best
+
+    def _negamax(self, cells, player, depth, alpha, beta, last, ply,
+                 deadline):
+        """
+        Returns the score of the position for player, the side to move,
+        where last is the square just played by the other side.
+        """
+        if time.perf_counter() > deadline:
+            raise Timeout
+        if self._wins_at(cells, last):
+            # the other side just won; sooner losses are worse
+            return -(WIN - ply)
+        moves = self._candidates(cells)
+        if not moves:
+            return 0
+        if depth == 0:
+            return self._evaluate(cells, player)
+
+        opponent = O if player == X else X
+        for move in moves:
+            cells[move] = player
+            score = -self._negamax(cells, opponent, depth - 1, -beta,
+                                   -alpha, move, ply + 1, deadline)
+            cells[move] = EMPTY
+            if score >= beta:
+                return score
+            if score > alpha:
+                alpha = score
+        return alpha
+
+    def _candidates(self, cells):
+        """
+        Returns the empty squares worth searching, nearest the center
+        first. On boards too big to search every square, only squares
+        next to a piece already played are considered.
+        """
+        empty = [s for s in self.order if cells[s] == EMPTY]
+        if self.m * self.n <= 16 or len(empty) == len(cells):
+            return empty
+        n = self.n
+        near = []
+        for s in empty:
+            i, j = divmod(s, n)
+            for ni in range(max(0, i - 1), min(self.m, i + 2)):
+                row = ni * n
+                if any(cells[row + nj] != EMPTY
+                       for nj in range(max(0, j - 1), min(n, j + 2))):
+                    near.append(s)
+                    break
+        return near
+
+    def _wins_at(self, cells, square):
+        """
+        Returns True if the piece on square is part of k in a row.
+        """
+        piece = cells[square]
+        i, j = divmod(square, self.n)
+        for di, dj in [(0, 1), (1, 0), (1, 1), (1, -1)]:
+            count = 1
+            for sign in [1, -1]:
+                ni, nj = i + sign * di, j + sign * dj
+                while (0 <= ni < self.m and 0 <= nj < self.n and
+                       cells[ni * self.n + nj] == piece):
+                    count += 1
+                    ni += sign * di
+                    nj += sign * dj
+            if count >= self.k:
+                return True
+        return False
+
+    def _evaluate(self, cells, player):
+        """
+        Returns a heuristic score of the position for player: every run
+        of k squares that only one side has played in counts for that
+        side, ten times more for each piece already in it.
+        """
+        score = 0
+        for window in self.windows:
+            xs = os = 0
+            for s in window:
+                cell = cells[s]
+                if cell == X:
+                    xs += 1
+                elif cell == O:
+                    os += 1
+            if xs and not os:
+                score += 10 ** xs
+            elif os and not xs:
+                score -= 10 ** os
+        return score if player == X else -score
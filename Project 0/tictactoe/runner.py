@@ -3,6 +3,7 @@ import sys
 import time
 
 import tictactoe as ttt
+from book import OpeningBook
 
 pygame.init()
 size = width, height = 600, 400
@@ -17,6 +18,7 @@ mediumFont = pygame.font.Font("OpenSans-Regular.ttf", 28)
 largeFont = pygame.font.Font("OpenSans-Regular.ttf", 40)
 moveFont = pygame.font.Font("OpenSans-Regular.ttf", 60)
 
+book = OpeningBook.load_or_generate()
 user = None
 board = ttt.initial_state()
 ai_turn = False
@@ -114,10 +116,7 @@ while True:
         if user != player and not game_over:
             if ai_turn:
                 time.sleep(0.5)
-                if(user == ttt.O):
-                    move = ttt.maximax(board)
-                else:
-                    move = ttt.minimax(board)
+                move = book.action(board)
                 board = ttt.result(board, move)
                 ai_turn = False
             else:
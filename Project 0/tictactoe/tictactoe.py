@@ -3,7 +3,6 @@ Tic Tac Toe Player
 """
 
 import math
-import copy
 
 X = "X"
 O = "O"
@@ -67,7 +66,7 @@ def result(board, action):
 
     # make sure square to be played in is blank
     if(board[i][j] == EMPTY):
-        new_board = copy.deepcopy(board)
+        new_board = [row[:] for row in board]
         new_board[i][j] = player_turn
         return new_board
 
@@ -182,3 +181,135 @@ def min_value(board):
     for action in actions(board):
         v = min(v, max_value(result(board, action)))
     return v
+
+
+# Squares in the order alpha-beta tries them: center, corners, edges
+MOVE_ORDER = [(1, 1), (0, 0), (0, 2), (2, 0), (2, 2),
+              (0, 1), (1, 0), (1, 2), (2, 1)]
+
+
+def ordered_actions(board):
+    """
+    Returns the possible actions on the board, strongest squares first.
+    """
+    return [action for action in MOVE_ORDER
+            if board[action[0]][action[1]] == EMPTY]
+
+
+def alphabeta(board):
+    """
+    Returns the optimal action for the current player on the board,
+    using minimax with alpha-beta pruning.
+    """
+    # ensure that the game isn't over
+    if(terminal(board)):
+        return None
+
+    alpha = -1 * float('inf')
+    beta = float('inf')
+    optimal_action = None
+    if(player(board) == X):
+        for action in ordered_actions(board):
+            temp_val = ab_min_value(result(board, action), alpha, beta)
+            if(temp_val > alpha):
+                alpha = temp_val
+                optimal_action = action
+    else:
+        for action in ordered_actions(board):
+            temp_val = ab_max_value(result(board, action), alpha, beta)
+            if(temp_val < beta):
+                beta = temp_val
+                optimal_action = action
+    return optimal_action
+
+
+def ab_max_value(board, alpha, beta):
+    if(terminal(board)):
+        return utility(board)
+
+    v = -1 * float('inf')
+    for action in ordered_actions(board):
+        v = max(v, ab_min_value(result(board, action), alpha, beta))
+        # O already has a better option elsewhere, so stop looking
+        if(v >= beta):
+            return v
+        alpha = max(alpha, v)
+    return v
+
+
+def ab_min_value(board, alpha, beta):
+    if(terminal(board)):
+        return utility(board)
+
+    v = float('inf')
+    for action in ordered_actions(board):
+        v = min(v, ab_max_value(result(board, action), alpha, beta))
+        # X already has a better option elsewhere, so stop looking
+        if(v <= alpha):
+            return v
+        beta = min(beta, v)
+    return v
+
+
+# Each of the 8 rotations and reflections of the board, as the square
+# (counting across rows) that lands in each square
+SYMMETRIES = [
+    [0, 1, 2, 3, 4, 5, 6, 7, 8],
+    [6, 3, 0, 7, 4, 1, 8, 5, 2],
+    [8, 7, 6, 5, 4, 3, 2, 1, 0],
+    [2, 5, 8, 1, 4, 7, 0, 3, 6],
+    [2, 1, 0, 5, 4, 3, 8, 7, 6],
+    [6, 7, 8, 3, 4, 5, 0, 1, 2],
+    [0, 3, 6, 1, 4, 7, 2, 5, 8],
+    [8, 5, 2, 7, 4, 1, 6, 3, 0]
+]
+
+# Maps canonical board keys to their minimax value
+transpositions = {}
+
+
+def board_key(board):
+    """
+    Returns a string that is the same for a board and all of its
+    rotations and reflections, which all have the same value.
+    """
+    cells = "".join(cell or "-" for row in board for cell in row)
+    return min("".join(cells[i] for i in symmetry)
+               for symmetry in SYMMETRIES)
+
+
+def cached_value(board):
+    """
+    Returns the minimax value of the board, remembering it for the
+    board and every board symmetric to it.
+    """
+    key = board_key(board)
+    if(key in transpositions):
+        return transpositions[key]
+
+    if(terminal(board)):
+        v = utility(board)
+    elif(player(board) == X):
+        v = max(cached_value(result(board, action))
+                for action in ordered_actions(board))
+    else:
+        v = min(cached_value(result(board, action))
+                for action in ordered_actions(board))
+    transpositions[key] = v
+    return v
+
+
+def cached_minimax(board):
+    """
+    Returns the optimal action for the current player on the board,
+    looking positions up in the transposition table where possible.
+    """
+    # ensure that the game isn't over
+    if(terminal(board)):
+        return None
+
+    if(player(board) == X):
+        return max(ordered_actions(board),
+                   key=lambda action: cached_value(result(board, action)))
+    return min(ordered_actions(board),
+               key=lambda action: cached_value(result(board, action)))
@@ -1,7 +1,45 @@
+import heapq
 import itertools
+import re
+import weakref
+
+
+class EvaluationException(Exception):
+    """Raised for a symbol that a model doesn't give a value."""
 
 
 class Sentence():
+    """
+    Sentences are immutable and interned: building a sentence equal to
+    one that already exists returns that same object, so sentences are
+    equal only if they are identical and hash by identity.
+    """
+
+    __slots__ = ("__weakref__",)
+
+    # Weak references to every sentence in use, by its class and parts
+    interned = {}
+
+    @classmethod
+    def intern(cls, *parts):
+        """
+        Returns the sentence of this class made of parts, in the order
+        of its __slots__, creating it if there isn't one already.
+        """
+        key = (cls,) + parts
+        reference = Sentence.interned.get(key)
+        if reference is not None:
+            sentence = reference()
+            if sentence is not None:
+                return sentence
+        sentence = object.__new__(cls)
+        for name, value in zip(cls.__slots__, parts):
+            object.__setattr__(sentence, name, value)
+        Sentence.interned[key] = weakref.KeyedRef(sentence, _forget, key)
+        return sentence
+
+    def __setattr__(self, name, value):
+        raise AttributeError("sentences are immutable")
 
     def evaluate(self, model):
         """Evaluates the logical sentence."""
@@ -15,6 +53,22 @@ class Sentence():
         """Returns a set of all symbols in the logical sentence."""
         return set()
 
+    def expression(self, index, part):
+        """
+        Returns Python source for the sentence's value in a model packed
+        into an integer m, symbol name s being bit index[s] of m, using
+        part(sentence) for the source of each sentence within it.
+        """
+        raise Exception("nothing to compile")
+
+    def truth_table(self, columns, full):
+        """
+        Returns the sentence's value in many models at once as the bits
+        of an integer, given each symbol's values as columns[name] and
+        full with a bit set for every model.
+        """
+        raise Exception("nothing to evaluate")
+
     @classmethod
     def validate(cls, sentence):
         if not isinstance(sentence, Sentence):
@@ -42,16 +96,20 @@ class Sentence():
             return f"({s})"
 
 
-class Symbol(Sentence):
+def _forget(reference):
+    """Removes a sentence that is no longer in use from the intern table."""
+    if Sentence.interned.get(reference.key) is reference:
+        del Sentence.interned[reference.key]
+
 
-    def __init__(self, name):
-        self.name = name
+class Symbol(Sentence):
+    __slots__ = ("name",)
 
-    def __eq__(self, other):
-        return isinstance(other, Symbol) and self.name == other.name
+    def __new__(cls, name):
+        return cls.intern(name)
 
-    def __hash__(self):
-        return hash(("symbol", self.name))
+    def __reduce__(self):
+        return (Symbol, (self.name,))
 
     def __repr__(self):
         return self.name
@@ -60,7 +118,7 @@ class Symbol(Sentence):
         try:
             return bool(model[self.name])
         except KeyError:
-            raise Exception(f"variable {self.name} not in model")
+            raise EvaluationException(f"variable {self.name} not in model")
 
     def formula(self):
         return self.name
@@ -68,17 +126,28 @@ class Symbol(Sentence):
     def symbols(self):
         return {self.name}
 
+    def expression(self, index, part):
+        try:
+            return f"(m & {1 << index[self.name]})"
+        except KeyError:
+            raise EvaluationException(f"variable {self.name} not in model")
+
+    def truth_table(self, columns, full):
+        try:
+            return columns[self.name]
+        except KeyError:
+            raise EvaluationException(f"variable {self.name} not in model")
+
 
 class Not(Sentence):
-    def __init__(self, operand):
-        Sentence.validate(operand)
-        self.operand = operand
+    __slots__ = ("operand",)
 
-    def __eq__(self, other):
-        return isinstance(other, Not) and self.operand == other.operand
+    def __new__(cls, operand):
+        Sentence.validate(operand)
+        return cls.intern(operand)
 
-    def __hash__(self):
-        return hash(("not", hash(self.operand)))
+    def __reduce__(self):
+        return (Not, (self.operand,))
 
     def __repr__(self):
         return f"Not({self.operand})"
@@ -92,20 +161,29 @@ class Not(Sentence):
     def symbols(self):
         return self.operand.symbols()
 
+    def expression(self, index, part):
+        return f"(not {part(self.operand)})"
+
+    def truth_table(self, columns, full):
+        return full ^ self.operand.truth_table(columns, full)
+
 
 class And(Sentence):
-    def __init__(self, *conjuncts):
+    __slots__ = ("conjuncts",)
+
+    def __new__(cls, *conjuncts):
+        # conjunctions within the conjunction are merged into it
+        flat = []
         for conjunct in conjuncts:
             Sentence.validate(conjunct)
-        self.conjuncts = list(conjuncts)
+            if isinstance(conjunct, And):
+                flat.extend(conjunct.conjuncts)
+            else:
+                flat.append(conjunct)
+        return cls.intern(tuple(flat))
 
-    def __eq__(self, other):
-        return isinstance(other, And) and self.conjuncts == other.conjuncts
-
-    def __hash__(self):
-        return hash(
-            ("and", tuple(hash(conjunct) for conjunct in self.conjuncts))
-        )
+    def __reduce__(self):
+        return (And, tuple(self.conjuncts))
 
     def __repr__(self):
         conjunctions = ", ".join(
@@ -113,10 +191,6 @@ class And(Sentence):
         )
         return f"And({conjunctions})"
 
-    def add(self, conjunct):
-        Sentence.validate(conjunct)
-        self.conjuncts.append(conjunct)
-
     def evaluate(self, model):
         return all(conjunct.evaluate(model) for conjunct in self.conjuncts)
 
@@ -129,20 +203,37 @@ class And(Sentence):
     def symbols(self):
         return set.union(*[conjunct.symbols() for conjunct in self.conjuncts])
 
+    def expression(self, index, part):
+        if not self.conjuncts:
+            return "True"
+        return "(" + " and ".join(
+            part(conjunct) for conjunct in self.conjuncts) + ")"
+
+    def truth_table(self, columns, full):
+        value = full
+        for conjunct in self.conjuncts:
+            value &= conjunct.truth_table(columns, full)
+            if not value:
+                break
+        return value
+
 
 class Or(Sentence):
-    def __init__(self, *disjuncts):
+    __slots__ = ("disjuncts",)
+
+    def __new__(cls, *disjuncts):
+        # disjunctions within the disjunction are merged into it
+        flat = []
         for disjunct in disjuncts:
             Sentence.validate(disjunct)
-        self.disjuncts = list(disjuncts)
+            if isinstance(disjunct, Or):
+                flat.extend(disjunct.disjuncts)
+            else:
+                flat.append(disjunct)
+        return cls.intern(tuple(flat))
 
-    def __eq__(self, other):
-        return isinstance(other, Or) and self.disjuncts == other.disjuncts
-
-    def __hash__(self):
-        return hash(
-            ("or", tuple(hash(disjunct) for disjunct in self.disjuncts))
-        )
+    def __reduce__(self):
+        return (Or, self.disjuncts)
 
     def __repr__(self):
         disjuncts = ", ".join([str(disjunct) for disjunct in self.disjuncts])
@@ -160,21 +251,31 @@ class Or(Sentence):
     def symbols(self):
         return set.union(*[disjunct.symbols() for disjunct in self.disjuncts])
 
+    def expression(self, index, part):
+        if not self.disjuncts:
+            return "False"
+        return "(" + " or ".join(
+            part(disjunct) for disjunct in self.disjuncts) + ")"
+
+    def truth_table(self, columns, full):
+        value = 0
+        for disjunct in self.disjuncts:
+            value |= disjunct.truth_table(columns, full)
+            if value == full:
+                break
+        return value
+
 
 class Implication(Sentence):
-    def __init__(self, antecedent, consequent):
+    __slots__ = ("antecedent", "consequent")
+
+    def __new__(cls, antecedent, consequent):
         Sentence.validate(antecedent)
         Sentence.validate(consequent)
-        self.antecedent = antecedent
-        self.consequent = consequent
+        return cls.intern(antecedent, consequent)
 
-    def __eq__(self, other):
-        return (isinstance(other, Implication)
-                and self.antecedent == other.antecedent
-                and self.consequent == other.consequent)
-
-    def __hash__(self):
-        return hash(("implies", hash(self.antecedent), hash(self.consequent)))
+    def __reduce__(self):
+        return (Implication, (self.antecedent, self.consequent))
 
     def __repr__(self):
         return f"Implication({self.antecedent}, {self.consequent})"
@@ -191,73 +292,1142 @@ class Implication(Sentence):
     def symbols(self):
         return set.union(self.antecedent.symbols(), self.consequent.symbols())
 
+    def expression(self, index, part):
+        antecedent = part(self.antecedent)
+        consequent = part(self.consequent)
+        return f"(not {antecedent} or {consequent})"
+
+    def truth_table(self, columns, full):
+        antecedent = self.antecedent.truth_table(columns, full)
+        if not antecedent:
+            return full
+        return (full ^ antecedent) | self.consequent.truth_table(columns, full)
+
 
 class Biconditional(Sentence):
-    def __init__(self, left, right):
+    __slots__ = ("left", "right")
+
+    def __new__(cls, left, right):
         Sentence.validate(left)
         Sentence.validate(right)
-        self.left = left
-        self.right = right
+        return cls.intern(left, right)
 
-    def __eq__(self, other):
-        return (isinstance(other, Biconditional)
-                and self.left == other.left
-                and self.right == other.right)
-
-    def __hash__(self):
-        return hash(("biconditional", hash(self.left), hash(self.right)))
+    def __reduce__(self):
+        return (Biconditional, (self.left, self.right))
 
     def __repr__(self):
         return f"Biconditional({self.left}, {self.right})"
 
     def evaluate(self, model):
-        return ((self.left.evaluate(model)
-                 and self.right.evaluate(model))
-                or (not self.left.evaluate(model)
-                    and not self.right.evaluate(model)))
+        return self.left.evaluate(model) == self.right.evaluate(model)
 
     def formula(self):
-        left = Sentence.parenthesize(str(self.left))
-        right = Sentence.parenthesize(str(self.right))
+        left = Sentence.parenthesize(self.left.formula())
+        right = Sentence.parenthesize(self.right.formula())
         return f"{left} <=> {right}"
 
     def symbols(self):
         return set.union(self.left.symbols(), self.right.symbols())
 
+    def expression(self, index, part):
+        left = part(self.left)
+        right = part(self.right)
+        return f"((not {left}) == (not {right}))"
+
+    def truth_table(self, columns, full):
+        left = self.left.truth_table(columns, full)
+        right = self.right.truth_table(columns, full)
+        return full ^ left ^ right
+
+
+# How deeply sentences nest in one compiled expression before the rest
+# is worked out into a variable first, well inside what Python can parse
+NESTING = 40
+
+
+def compile_sentence(sentence, index):
+    """
+    Compiles sentence into a function of a model packed into an integer,
+    where symbol name s is bit index[s], that is true when the sentence
+    is true in that model.
+    """
+    lines = []
+    depth = 0
+
+    def part(sentence):
+        nonlocal depth
+        if depth < NESTING:
+            depth += 1
+            source = sentence.expression(index, part)
+            depth -= 1
+            return source
+
+        # too deep to nest any further, so start a new statement
+        outer, depth = depth, 0
+        source = sentence.expression(index, part)
+        depth = outer
+        name = f"t{len(lines)}"
+        lines.append(f"    {name} = {source}\n")
+        return name
+
+    try:
+        result = part(sentence)
+    except RecursionError:
+        # deeper than even this can manage, so walk the tree instead
+        symbols = list(index.items())
+        return lambda m: sentence.evaluate(
+            {name: bool(m >> i & 1) for name, i in symbols})
+
+    namespace = {}
+    exec("def compiled(m):\n" + "".join(lines)
+         + f"    return {result}\n", namespace)
+    return namespace["compiled"]
+
+
+# Models evaluated together by the truth table checks, as a power of two
+CHUNK = 16
+
+
+def truth_tables(sentences, symbols, chunk=CHUNK):
+    """
+    Yields the truth values of sentences over every model of symbols,
+    2 ** chunk models at a time, as the number of the first model in
+    the chunk and a list of integers with a bit per model, bit m for
+    model start + m. Symbol symbols[i] is bit i of a model's number.
+    """
+    chunk = min(chunk, len(symbols))
+    size = 1 << chunk
+    full = (1 << size) - 1
+
+    # Within a chunk the first symbols alternate in runs of 2 ** i
+    columns = {}
+    for i, symbol in enumerate(symbols[:chunk]):
+        run = 1 << i
+        block = ((1 << run) - 1) << run
+        columns[symbol] = block * (full // ((1 << (2 * run)) - 1))
+
+    # and the rest are the same for the whole chunk
+    for start in range(0, 1 << len(symbols), size):
+        for i in range(chunk, len(symbols)):
+            columns[symbols[i]] = full if start >> i & 1 else 0
+        yield start, [s.truth_table(columns, full) for s in sentences]
+
+
+def truth_table_check(knowledge, query, chunk=CHUNK):
+    """
+    Checks if knowledge base entails query, like model_check, evaluating
+    the sentences over whole chunks of the truth table at once.
+    """
+    symbols = sorted(set.union(knowledge.symbols(), query.symbols()))
+    for _, (known, answer) in truth_tables([knowledge, query], symbols, chunk):
+        if known & ~answer:
+            return False
+    return True
+
+
+def truth_table_models(knowledge, chunk=CHUNK):
+    """Yields each model in which knowledge is true, as a dict."""
+    symbols = sorted(knowledge.symbols())
+    for start, (known,) in truth_tables([knowledge], symbols, chunk):
+        while known:
+            low = known & -known
+            known ^= low
+            model = start + low.bit_length() - 1
+            yield {symbol: bool(model >> i & 1)
+                   for i, symbol in enumerate(symbols)}
+
 
 def model_check(knowledge, query):
     """Checks if knowledge base entails query."""
 
-    def check_all(knowledge, query, symbols, model):
-        """Checks if knowledge base entails query, given a particular model."""
-
-        # If model has an assignment for each symbol
-        if not symbols:
-
-            # If knowledge base is true in model, then query must also be true
-            if knowledge.evaluate(model):
-                return query.evaluate(model)
-            return True
+    # Get all symbols in both knowledge and query, numbering each one
+    symbols = sorted(set.union(knowledge.symbols(), query.symbols()))
+    index = {symbol: i for i, symbol in enumerate(symbols)}
+
+    # Compile both so a model is an integer, one bit per symbol
+    knowledge = compile_sentence(knowledge, index)
+    query = compile_sentence(query, index)
+
+    # Wherever knowledge base is true in a model, query must also be true
+    for model in range(1 << len(symbols)):
+        if knowledge(model) and not query(model):
+            return False
+    return True
+
+
+class CNF():
+    """
+    Translates sentences into clauses in conjunctive normal form.
+
+    Symbols are numbered from 1 and a clause is a list of nonzero
+    integers, n for symbol n and -n for its negation. Compound
+    sentences get a new variable of their own standing for their
+    value (the Tseitin encoding), so the clauses grow linearly with
+    the sentence instead of exponentially.
+    """
+
+    def __init__(self):
+        self.variables = {}
+        self.names = {}
+        self.clauses = []
+        self.count = 0
+        self.literals = {}
+
+    def variable(self, name):
+        """Returns the variable numbered for a symbol name."""
+        if name not in self.variables:
+            self.count += 1
+            self.variables[name] = self.count
+            self.names[self.count] = name
+        return self.variables[name]
+
+    def fresh(self):
+        """Returns a new variable that stands for no symbol."""
+        self.count += 1
+        return self.count
+
+    def add(self, sentence):
+        """Adds clauses asserting that sentence is true."""
+        if isinstance(sentence, And):
+            for conjunct in sentence.conjuncts:
+                self.add(conjunct)
+        elif isinstance(sentence, Or):
+            self.clauses.append(
+                [self.literal(disjunct) for disjunct in sentence.disjuncts])
+        elif isinstance(sentence, Implication):
+            self.clauses.append([-self.literal(sentence.antecedent),
+                                 self.literal(sentence.consequent)])
         else:
+            self.clauses.append([self.literal(sentence)])
+
+    def literal(self, sentence):
+        """
+        Returns a literal that is true exactly when sentence is,
+        adding whatever clauses are needed to define it.
+        """
+        if isinstance(sentence, Symbol):
+            return self.variable(sentence.name)
+        if isinstance(sentence, Not):
+            return -self.literal(sentence.operand)
+
+        # compound sentences are defined once, however often they appear
+        if sentence in self.literals:
+            return self.literals[sentence]
+
+        if isinstance(sentence, And):
+            parts = [self.literal(c) for c in sentence.conjuncts]
+            x = self.fresh()
+            for part in parts:
+                self.clauses.append([-x, part])
+            self.clauses.append([x] + [-part for part in parts])
+        elif isinstance(sentence, Or):
+            parts = [self.literal(d) for d in sentence.disjuncts]
+            x = self.fresh()
+            for part in parts:
+                self.clauses.append([x, -part])
+            self.clauses.append([-x] + parts)
+        elif isinstance(sentence, Implication):
+            a = self.literal(sentence.antecedent)
+            b = self.literal(sentence.consequent)
+            x = self.fresh()
+            self.clauses.extend([[-x, -a, b], [x, a], [x, -b]])
+        elif isinstance(sentence, Biconditional):
+            a = self.literal(sentence.left)
+            b = self.literal(sentence.right)
+            x = self.fresh()
+            self.clauses.extend([[-x, -a, b], [-x, a, -b],
+                                 [x, a, b], [x, -a, -b]])
+        else:
+            raise TypeError("must be a logical sentence")
 
-            # Choose one of the remaining unused symbols
-            remaining = symbols.copy()
-            p = remaining.pop()
-
-            # Create a model where the symbol is true
-            model_true = model.copy()
-            model_true[p] = True
-
-            # Create a model where the symbol is false
-            model_false = model.copy()
-            model_false[p] = False
-
-            # Ensure entailment holds in both models
-            return (check_all(knowledge, query, remaining, model_true) and
-                    check_all(knowledge, query, remaining, model_false))
+        self.literals[sentence] = x
+        return x
+
+
+class Solver():
+    """
+    A conflict-driven clause learning SAT solver.
+
+    Clauses are watched on two literals so unit propagation only looks
+    at clauses that might have become unit, each conflict is analysed
+    into a learned clause that stops the same conflict from happening
+    again, and branching favours variables seen in recent conflicts.
+    Learned clauses follow from the clauses added, so they are kept
+    from one call to solve to the next.
+    """
+
+    def __init__(self, clauses=()):
+        self.count = 0
+        self.clauses = []
+        self.watches = [[], []]
+        self.assigns = [0]
+        self.levels = [0]
+        self.reasons = [None]
+        self.activity = [0.0]
+        self.polarity = [False]
+        self.trail = []
+        self.limits = []
+        self.head = 0
+        self.heap = []
+        self.increment = 1.0
+        self.conflicts = 0
+        self.ok = True
+        self.model = None
+        for clause in clauses:
+            self.add_clause(clause)
+
+    def reserve(self, count):
+        """Makes room for variables numbered up to count."""
+        while self.count < count:
+            self.count += 1
+            self.watches.extend([[], []])
+            self.assigns.append(0)
+            self.levels.append(0)
+            self.reasons.append(None)
+            self.activity.append(0.0)
+            self.polarity.append(False)
+            heapq.heappush(self.heap, (0.0, self.count))
+
+    def value(self, literal):
+        """Returns 1 if literal is true, -1 if false, 0 if unassigned."""
+        value = self.assigns[abs(literal)]
+        return value if literal > 0 else -value
+
+    def add_clause(self, clause):
+        """
+        Adds a clause, returning False if the clauses are now known to
+        be unsatisfiable.
+        """
+        if not self.ok:
+            return False
+        self._backtrack(0)
+        self.reserve(max((abs(literal) for literal in clause), default=0))
+
+        literals = []
+        for literal in clause:
+            value = self.value(literal)
+            if value == 1 or -literal in literals:
+                # already satisfied, or always true
+                return True
+            if value == 0 and literal not in literals:
+                literals.append(literal)
+
+        if not literals:
+            self.ok = False
+        elif len(literals) == 1:
+            self._assign(literals[0], None)
+            self.ok = self._propagate() is None
+        else:
+            self._watch(literals)
+        return self.ok
+
+    def solve(self, assumptions=()):
+        """
+        Returns True if the clauses can all be satisfied with every
+        literal in assumptions true, leaving a satisfying assignment in
+        self.model, and False otherwise.
+        """
+        self.model = None
+        if not self.ok:
+            return False
+        self._backtrack(0)
+        self.reserve(max((abs(a) for a in assumptions), default=0))
+        restart = 100
+
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                if not self.limits:
+                    self.ok = False
+                    return False
+                learned, level = self._analyze(conflict)
+                self._backtrack(level)
+                if len(learned) == 1:
+                    self._assign(learned[0], None)
+                else:
+                    self._watch(learned)
+                    self._assign(learned[0], learned)
+                self.increment /= 0.95
+                restart -= 1
+                continue
+
+            if restart <= 0:
+                # start over now and then, keeping what has been learned
+                restart = 100 + self.conflicts // 10
+                self._backtrack(0)
+                continue
+
+            if len(self.limits) < len(assumptions):
+                literal = assumptions[len(self.limits)]
+                value = self.value(literal)
+                self.limits.append(len(self.trail))
+                if value == -1:
+                    self._backtrack(0)
+                    return False
+                if value == 0:
+                    self._assign(literal, None)
+                continue
+
+            variable = self._branch()
+            if variable is None:
+                self.model = [value == 1 for value in self.assigns]
+                self._backtrack(0)
+                return True
+            self.limits.append(len(self.trail))
+            self._assign(
+                variable if self.polarity[variable] else -variable, None)
+
+    def _watch(self, clause):
+        self.clauses.append(clause)
+        self.watches[self._index(clause[0])].append(clause)
+        self.watches[self._index(clause[1])].append(clause)
+
+    @staticmethod
+    def _index(literal):
+        return 2 * literal if literal > 0 else -2 * literal + 1
+
+    def _assign(self, literal, reason):
+        variable = abs(literal)
+        self.assigns[variable] = 1 if literal > 0 else -1
+        self.levels[variable] = len(self.limits)
+        self.reasons[variable] = reason
+        self.trail.append(literal)
+
+    def _propagate(self):
+        """
+        Assigns every literal forced by a clause with all but one of its
+        literals false, returning a clause with all literals false if
+        there is one.
+        """
+        assigns = self.assigns
+        while self.head < len(self.trail):
+            false = -self.trail[self.head]
+            self.head += 1
+            watching = self.watches[self._index(false)]
+            kept = []
+            for n, clause in enumerate(watching):
+                # keep the literal that just became false in slot 1
+                if clause[0] == false:
+                    clause[0], clause[1] = clause[1], false
+                first = clause[0]
+                value = assigns[abs(first)]
+                if (value if first > 0 else -value) == 1:
+                    kept.append(clause)
+                    continue
+
+                # look for another literal that isn't false to watch
+                for k in range(2, len(clause)):
+                    literal = clause[k]
+                    value = assigns[abs(literal)]
+                    if (value if literal > 0 else -value) != -1:
+                        clause[1], clause[k] = literal, false
+                        self.watches[self._index(literal)].append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    value = assigns[abs(first)]
+                    if (value if first > 0 else -value) == -1:
+                        kept.extend(watching[n + 1:])
+                        self.watches[self._index(false)] = kept
+                        return clause
+                    self._assign(first, clause)
+            self.watches[self._index(false)] = kept
+        return None
+
+    def _analyze(self, conflict):
+        """
+        Returns a learned clause, asserting literal first, and the level
+        to go back to, found by resolving the conflict back to the first
+        literal on the current level that all of it depends on.
+        """
+        level = len(self.limits)
+        seen = set()
+        learned = [None]
+        pending = 0
+        literal = None
+        clause = conflict
+        index = len(self.trail) - 1
+
+        while True:
+            for other in (clause if literal is None else clause[1:]):
+                variable = abs(other)
+                if variable not in seen and self.levels[variable] > 0:
+                    seen.add(variable)
+                    self._bump(variable)
+                    if self.levels[variable] == level:
+                        pending += 1
+                    else:
+                        learned.append(other)
+            while abs(self.trail[index]) not in seen:
+                index -= 1
+            literal = self.trail[index]
+            index -= 1
+            clause = self.reasons[abs(literal)]
+            seen.discard(abs(literal))
+            pending -= 1
+            if pending == 0:
+                break
+
+        learned[0] = -literal
+        if len(learned) == 1:
+            return learned, 0
+        # watch the literal from the deepest remaining level second
+        deepest = max(range(1, len(learned)),
+                      key=lambda i: self.levels[abs(learned[i])])
+        learned[1], learned[deepest] = learned[deepest], learned[1]
+        return learned, self.levels[abs(learned[1])]
+
+    def _bump(self, variable):
+        self.activity[variable] += self.increment
+        if self.activity[variable] > 1e100:
+            self.activity = [a * 1e-100 for a in self.activity]
+            self.increment *= 1e-100
+            self.heap = [(-self.activity[v], v)
+                         for v in range(1, self.count + 1)]
+            heapq.heapify(self.heap)
+        else:
+            heapq.heappush(self.heap, (-self.activity[variable], variable))
+
+    def _branch(self):
+        """Returns the most active unassigned variable, or None."""
+        while self.heap:
+            activity, variable = heapq.heappop(self.heap)
+            if (self.assigns[variable] == 0 and
+                    -activity == self.activity[variable]):
+                return variable
+        # entries go stale as activity changes; rebuild if any are left
+        unassigned = [v for v in range(1, self.count + 1)
+                      if self.assigns[v] == 0]
+        if not unassigned:
+            return None
+        self.heap = [(-self.activity[v], v) for v in unassigned]
+        heapq.heapify(self.heap)
+        return self._branch()
+
+    def _backtrack(self, level):
+        """Undoes every assignment made above level."""
+        if len(self.limits) <= level:
+            return
+        start = self.limits[level]
+        for literal in self.trail[start:]:
+            variable = abs(literal)
+            self.polarity[variable] = literal > 0
+            self.assigns[variable] = 0
+            self.reasons[variable] = None
+            heapq.heappush(self.heap, (-self.activity[variable], variable))
+        del self.trail[start:]
+        del self.limits[level:]
+        self.head = len(self.trail)
+
+
+class KnowledgeBase(And):
+    """
+    A conjunction that is built up one sentence at a time and queried in
+    between, as in clue.py. Unlike other sentences it can be changed, so
+    it isn't interned.
+
+    The symbols of the sentences are kept as they're added instead of
+    being worked out from the whole tree each time, and so are their
+    clauses, given to a solver that is kept from one query to the next
+    along with everything it has learned.
+    """
+
+    __setattr__ = object.__setattr__
+
+    def __new__(cls, *sentences):
+        return object.__new__(cls)
+
+    def __init__(self, *sentences):
+        self.conjuncts = []
+        self.known = set()
+        self.cnf = CNF()
+        self.solver = Solver()
+        self.given = 0
+        for sentence in sentences:
+            self.add(sentence)
+
+    def __reduce__(self):
+        return (KnowledgeBase, tuple(self.conjuncts))
 
-    # Get all symbols in both knowledge and query
-    symbols = set.union(knowledge.symbols(), query.symbols())
+    def add(self, conjunct):
+        Sentence.validate(conjunct)
+        self.conjuncts.append(conjunct)
+        self.known |= conjunct.symbols()
+        self.cnf.add(conjunct)
 
-    # Check that knowledge entails query
-    return check_all(knowledge, query, symbols, dict())
+    def symbols(self):
+        return set(self.known)
+
+    def entails(self, query):
+        """Checks if the knowledge base entails query."""
+        literal = self.cnf.literal(query)
+        self._update()
+        return not self.solver.solve([-literal])
+
+    def query_all(self, queries):
+        """
+        Returns a dict of whether the knowledge base entails each query:
+        True if it does, False if it entails the query is false, or None
+        if it could be either.
+        """
+        literals = [self.cnf.literal(query) for query in queries]
+        self._update()
+        if not self.solver.solve():
+            return {query: True for query in queries}
+
+        # every model found settles each query it makes true or false,
+        # so only a query no model has gone the other way needs a solve
+        possible = set()
+        self._note(literals, possible)
+        for literal in literals:
+            for goal in (literal, -literal):
+                if goal not in possible and self.solver.solve([goal]):
+                    self._note(literals, possible)
+
+        answers = {}
+        for query, literal in zip(queries, literals):
+            if literal in possible and -literal in possible:
+                answers[query] = None
+            else:
+                answers[query] = literal in possible
+        return answers
+
+    def _note(self, literals, possible):
+        """Adds whichever of each literal or its negation the model has."""
+        model = self.solver.model
+        for literal in literals:
+            if model[abs(literal)] == (literal > 0):
+                possible.add(literal)
+            else:
+                possible.add(-literal)
+
+    def _update(self):
+        """Gives the solver any clauses it hasn't seen yet."""
+        self.solver.reserve(self.cnf.count)
+        clauses = self.cnf.clauses
+        for clause in clauses[self.given:]:
+            self.solver.add_clause(clause)
+        self.given = len(clauses)
+
+
+def sat_check(knowledge, query):
+    """
+    Checks if knowledge base entails query, like model_check, by asking
+    a SAT solver whether knowledge and not query can both hold.
+    """
+    if isinstance(knowledge, KnowledgeBase):
+        return knowledge.entails(query)
+    cnf = CNF()
+    cnf.add(knowledge)
+    query = cnf.literal(query)
+    solver = Solver(cnf.clauses)
+    return not solver.solve([-query])
+
+
+def query_all(knowledge, queries):
+    """
+    Checks what knowledge base entails about every query at once,
+    returning a dict of True for each query it entails, False for each
+    it entails is false, and None for the rest.
+    """
+    if not isinstance(knowledge, KnowledgeBase):
+        knowledge = KnowledgeBase(knowledge)
+    return knowledge.query_all(queries)
+
+
+class _Assignment():
+    """
+    Values given to the variables of clauses like those from CNF, each
+    one along with the values the unit clauses it leads to force, kept
+    in the order they were given so they can be taken back again.
+
+    Each clause keeps count of its literals that are true and false,
+    and each literal knows its clauses, so giving a value only looks at
+    the clauses it satisfies or shortens.
+    """
+
+    def __init__(self, clauses, count):
+        self.clauses = clauses
+        self.values = [None] * (count + 1)
+        self.trail = []
+        self.true = [0] * len(clauses)
+        self.false = [0] * len(clauses)
+        self.containing = {}
+        for i, clause in enumerate(clauses):
+            for literal in clause:
+                self.containing.setdefault(literal, []).append(i)
+
+    def value(self, variable):
+        """Returns the variable's value, or None if it hasn't one."""
+        return self.values[variable]
+
+    def assume(self, literals):
+        """
+        Makes literals and all the unit clauses they lead to true,
+        returning False if that makes a clause false, in which case the
+        values given so far should be taken back with undo.
+        """
+        queue = list(literals)
+        while queue:
+            literal = queue.pop()
+            value = self.values[abs(literal)]
+            if value is not None:
+                if value != (literal > 0):
+                    return False
+                continue
+            self.values[abs(literal)] = literal > 0
+            self.trail.append(literal)
+            for i in self.containing.get(literal, ()):
+                self.true[i] += 1
+            conflict = False
+            for i in self.containing.get(-literal, ()):
+                self.false[i] += 1
+                if self.true[i]:
+                    continue
+                unset = len(self.clauses[i]) - self.false[i]
+                if not unset:
+                    conflict = True
+                elif unset == 1:
+                    queue.extend(l for l in self.clauses[i]
+                                 if self.values[abs(l)] is None)
+            if conflict:
+                return False
+        return True
+
+    def undo(self, mark):
+        """Takes back every value given after the first mark of them."""
+        while len(self.trail) > mark:
+            literal = self.trail.pop()
+            self.values[abs(literal)] = None
+            for i in self.containing.get(literal, ()):
+                self.true[i] -= 1
+            for i in self.containing.get(-literal, ()):
+                self.false[i] -= 1
+
+    def remaining(self):
+        """Returns the clauses not yet satisfied, without false literals."""
+        return [
+            tuple(l for l in clause if self.values[abs(l)] is None)
+            for clause, true in zip(self.clauses, self.true) if not true
+        ]
+
+
+class _Component():
+    """
+    A component of clauses that ModelCounter is counting: the ways left
+    to set its branching variable, the total so far, and for the branch
+    under way, its components still to count, the product of the counts
+    of the rest, and how many variables it leaves free.
+    """
+    __slots__ = ("clauses", "key", "size", "literals", "total",
+                 "components", "product", "free")
+
+    def __init__(self, clauses, key, size, literals):
+        self.clauses = clauses
+        self.key = key
+        self.size = size
+        self.literals = literals
+        self.total = 0
+        self.components = []
+        self.product = 0
+        self.free = 0
+
+
+class ModelCounter():
+    """
+    Counts the models of clauses like those from CNF without listing
+    them, as a #SAT solver does.
+
+    Setting a variable and following the unit clauses that gives often
+    splits the clauses into components that share no variables, which
+    are counted on their own and multiplied together; and since the same
+    component turns up again and again down different branches, each
+    one's count is remembered.
+    """
+
+    def __init__(self):
+        self.cache = {}
+
+    def count(self, clauses):
+        """Returns the number of models of clauses over their variables."""
+        if not all(clauses):
+            # an empty clause can't be made true
+            return 0
+
+        # Keeps its own stack of the components being counted rather than
+        # recursing, since a long chain of clauses can branch more times
+        # in a row than Python could recurse. The outermost one stands for
+        # the clauses themselves, with one branch setting nothing.
+        outer = _Component(None, None, 0, [])
+        outer.components = self.components(clauses)
+        outer.product = 1
+        stack = [outer]
+        while True:
+            frame = stack[-1]
+
+            # multiply together the counts of this branch's components
+            if frame.product and frame.components:
+                clauses = frame.components.pop()
+                key = frozenset(clauses)
+                if key in self.cache:
+                    frame.product *= self.cache[key]
+                else:
+                    stack.append(self.branch(clauses, key))
+                continue
+
+            # then move on to the next way of setting the variable that
+            # doesn't make a clause false
+            frame.total += frame.product << frame.free
+            frame.product = 0
+            while frame.literals and not frame.product:
+                reduced = self.assume(frame.clauses, [frame.literals.pop()])
+                if reduced is not None:
+                    remaining, true = reduced
+                    frame.free = (frame.size - len(true)
+                                  - len(self.variables(remaining)))
+                    frame.components = self.components(remaining)
+                    frame.product = 1
+            if frame.product:
+                continue
+
+            stack.pop()
+            if not stack:
+                return frame.total
+            self.cache[frame.key] = frame.total
+            stack[-1].product *= frame.total
+
+    @staticmethod
+    def branch(clauses, key):
+        """
+        Starts counting a component of clauses, which key identifies, by
+        choosing the variable to set each way.
+        """
+        occurrences = {}
+        for clause in clauses:
+            for literal in clause:
+                variable = abs(literal)
+                occurrences[variable] = occurrences.get(variable, 0) + 1
+
+        # branch on a variable in the most clauses, taking the middle one
+        # of those in the order they turn up, which splits a chain of
+        # clauses in two rather than taking one off the end
+        most = max(occurrences.values())
+        tied = [v for v, count in occurrences.items() if count == most]
+        variable = tied[len(tied) // 2]
+        return _Component(clauses, key, len(occurrences),
+                          [-variable, variable])
+
+    @staticmethod
+    def assume(clauses, literals):
+        """
+        Returns the clauses left over once literals and all the unit
+        clauses they lead to are true, and the set of literals made
+        true, or None if that makes a clause false.
+        """
+        # the clauses each literal is in, so that making a literal true
+        # only looks at the clauses it satisfies or shortens
+        containing = {}
+        for i, clause in enumerate(clauses):
+            for literal in clause:
+                containing.setdefault(literal, []).append(i)
+        unset = [len(clause) for clause in clauses]
+        satisfied = [False] * len(clauses)
+
+        true = set()
+        queue = list(literals)
+        queue.extend(clause[0] for clause in clauses if len(clause) == 1)
+        while queue:
+            literal = queue.pop()
+            if literal in true:
+                continue
+            if -literal in true:
+                return None
+            true.add(literal)
+            for i in containing.get(literal, ()):
+                satisfied[i] = True
+            for i in containing.get(-literal, ()):
+                if satisfied[i]:
+                    continue
+                unset[i] -= 1
+                if not unset[i]:
+                    return None
+                if unset[i] == 1:
+                    queue.extend(l for l in clauses[i] if -l not in true)
+
+        remaining = [
+            tuple(l for l in clause if -l not in true)
+            for clause, done in zip(clauses, satisfied) if not done
+        ]
+        return remaining, true
+
+    @staticmethod
+    def variables(clauses):
+        return {abs(literal) for clause in clauses for literal in clause}
+
+    @staticmethod
+    def components(clauses):
+        """Splits clauses into groups that share no variables."""
+        parents = {}
+
+        def find(variable):
+            root = variable
+            while parents.setdefault(root, root) != root:
+                root = parents[root]
+            while variable != root:
+                parents[variable], variable = root, parents[variable]
+            return root
+
+        for clause in clauses:
+            first = find(abs(clause[0]))
+            for literal in clause[1:]:
+                other = find(abs(literal))
+                if other != first:
+                    parents[other] = first
+
+        groups = {}
+        for clause in clauses:
+            groups.setdefault(find(abs(clause[0])), []).append(clause)
+        return list(groups.values())
+
+
+def _model_clauses(knowledge):
+    """
+    Returns the CNF for knowledge and its clauses as tuples, leaving out
+    any that are always true.
+    """
+    cnf = CNF()
+    cnf.add(knowledge)
+    clauses = []
+    for clause in cnf.clauses:
+        clause = tuple(dict.fromkeys(clause))
+        if not any(-literal in clause for literal in clause):
+            clauses.append(clause)
+    return cnf, clauses
+
+
+def count_models(knowledge):
+    """
+    Returns the number of models of knowledge's symbols in which
+    knowledge is true.
+    """
+    cnf, clauses = _model_clauses(knowledge)
+
+    # the encoding's own variables are fixed by the symbols, so each
+    # model of the clauses is one of knowledge
+    free = cnf.count - len(ModelCounter.variables(clauses))
+    return ModelCounter().count(clauses) << free
+
+
+def iter_models(knowledge):
+    """
+    Yields each model in which knowledge is true, as a dict of its
+    symbols' values, without going down any branch that has none.
+    """
+    cnf, clauses = _model_clauses(knowledge)
+    counter = ModelCounter()
+    symbols = sorted(cnf.variables)
+    assignment = _Assignment(clauses, cnf.count)
+
+    def count():
+        # the models of what's left, over every variable not yet set
+        remaining = assignment.remaining()
+        free = (cnf.count - len(assignment.trail)
+                - len(ModelCounter.variables(remaining)))
+        return counter.count(remaining) << free
+
+    units = [clause[0] for clause in clauses if len(clause) == 1]
+    if not assignment.assume(units):
+        return
+
+    # each branch still to go down, as how much of the trail comes before
+    # it, the literal setting it, how many models it has and the index of
+    # the next symbol to set, kept on a stack rather than recursing as a
+    # long chain needs
+    branches = [(0, None, count(), 0)]
+    while branches:
+        mark, literal, models, i = branches.pop()
+        if not models:
+            continue
+        assignment.undo(mark)
+        if literal is not None:
+            assignment.assume([literal])
+
+        # skip symbols already set by following unit clauses
+        while i < len(symbols) and assignment.value(
+                cnf.variables[symbols[i]]) is not None:
+            i += 1
+        if i == len(symbols):
+            yield {symbol: assignment.value(cnf.variables[symbol])
+                   for symbol in symbols}
+            continue
+
+        # a value that makes a clause false leaves the other with all the
+        # models, and only when both can be taken do they need counting,
+        # which one count does as between them they have them all
+        variable = cnf.variables[symbols[i]]
+        mark = len(assignment.trail)
+        true = assignment.assume([variable])
+        assignment.undo(mark)
+        false = assignment.assume([-variable])
+        if not true:
+            positive = 0
+        elif not false:
+            positive = models
+        else:
+            assignment.undo(mark)
+            assignment.assume([variable])
+            positive = count()
+        branches.append((mark, -variable, models - positive, i + 1))
+        branches.append((mark, variable, positive, i + 1))
+
+
+# Operators, parentheses and symbol names in a formula, where a name is
+# anything up to the next operator or parenthesis
+FORMULA_TOKENS = re.compile(
+    r"<=>|=>|[()¬∧∨]|(?:(?!<=>|=>)[^()¬∧∨])+"
+)
+
+
+def parse(text):
+    """
+    Returns the sentence written as text in the notation formula() uses,
+    where ¬ binds tightest, then ∧, ∨, => and <=>.
+    """
+    tokens = [token.strip() for token in FORMULA_TOKENS.findall(text)]
+    tokens = [token for token in tokens if token]
+    if not tokens:
+        return And()
+
+    def unexpected(token):
+        found = "end of formula" if token is None else repr(token)
+        return ValueError(f"unexpected {found} in formula {text!r}")
+
+    # Works through the tokens with a stack of the parentheses still
+    # open, rather than recursing, so that formulas nested deeper than
+    # Python could recurse still parse. Each holds the sentences and
+    # operators read inside it so far, along with how many ¬ are waiting
+    # for the next sentence.
+    groups = [[]]
+    negations = [0]
+    operand = True
+    for token in tokens:
+        if operand:
+            if token == "¬":
+                negations[-1] += 1
+                continue
+            if token == "(":
+                groups.append([])
+                negations.append(0)
+                continue
+            if token in ("<=>", "=>", "∨", "∧", ")"):
+                raise unexpected(token)
+            sentence = Symbol(token)
+        elif token in ("<=>", "=>", "∨", "∧"):
+            groups[-1].append(token)
+            operand = True
+            continue
+        elif token == ")" and len(groups) > 1:
+            sentence = _combine(groups.pop())
+            negations.pop()
+        else:
+            raise unexpected(token)
+
+        for _ in range(negations[-1]):
+            sentence = Not(sentence)
+        negations[-1] = 0
+        groups[-1].append(sentence)
+        operand = False
+
+    if operand or len(groups) > 1:
+        raise unexpected(None)
+    return _combine(groups[0])
+
+
+def _combine(items):
+    """
+    Returns the sentence made of items, sentences with an operator
+    between each pair, where ¬ binds tightest, then ∧, ∨, => and <=>.
+    """
+    sentences = items[0::2]
+    operators = items[1::2]
+
+    # group the sentences joined by each operator in turn, from the one
+    # that binds tightest; ∧ and ∨ join a whole run of them at once, and
+    # => and <=> group to the right
+    for operator in ("∧", "∨", "=>", "<=>"):
+        runs = [[sentences[0]]]
+        rest = []
+        for between, sentence in zip(operators, sentences[1:]):
+            if between == operator:
+                runs[-1].append(sentence)
+            else:
+                runs.append([sentence])
+                rest.append(between)
+
+        sentences = []
+        for run in runs:
+            if operator == "∧" and len(run) > 1:
+                sentences.append(And(*run))
+            elif operator == "∨" and len(run) > 1:
+                sentences.append(Or(*run))
+            else:
+                sentence = run.pop()
+                kind = Implication if operator == "=>" else Biconditional
+                while run:
+                    sentence = kind(run.pop(), sentence)
+                sentences.append(sentence)
+        operators = rest
+    return sentences[0]
+
+
+def read_formulas(file):
+    """
+    Yields the sentence on each line of file, skipping blank lines and
+    lines starting with #.
+    """
+    for line in file:
+        line = line.strip()
+        if line and not line.startswith("#"):
+            yield parse(line)
+
+
+def write_formulas(sentences, file):
+    """Writes each sentence's formula to file, one to a line."""
+    for sentence in sentences:
+        file.write(sentence.formula() + "\n")
+
+
+def read_dimacs(file):
+    """
+    Yields each clause in a DIMACS CNF file as a list of integers, as
+    CNF and Solver use them, reading the file a line at a time.
+    """
+    clause = []
+    for line in file:
+        first = line.lstrip()[:1]
+        if not first or first in "cp":
+            continue
+        if first == "%":
+            # some benchmark sets end their files this way
+            break
+        for literal in map(int, line.split()):
+            if literal:
+                clause.append(literal)
+            else:
+                yield clause
+                clause = []
+    if clause:
+        yield clause
+
+
+def write_dimacs(cnf, file):
+    """
+    Writes the clauses of cnf to file in DIMACS CNF format, naming each
+    symbol's variable in a comment.
+    """
+    for name, variable in cnf.variables.items():
+        file.write(f"c {variable} {name}\n")
+    file.write(f"p cnf {cnf.count} {len(cnf.clauses)}\n")
+    for clause in cnf.clauses:
+        file.write(" ".join(map(str, clause)) + " 0\n")
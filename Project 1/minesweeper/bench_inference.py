@@ -0,0 +1,82 @@
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+from minesweeper import Minesweeper, MinesweeperAI
+
+
+def timer():
+    """Measures how long a call takes."""
+    start = time.perf_counter()
+    return lambda: time.perf_counter() - start
+
+
+def play(height, width, mines, seed, measure=timer):
+    """
+    Plays one game the way runner.py's AI does, returning what measure
+    makes of each call to add_knowledge and whether the game was won.
+    measure is called before the call and returns a function to call
+    after it, which returns the measurement.
+    """
+    random.seed(seed)
+    game = Minesweeper(height=height, width=width, mines=mines)
+    ai = MinesweeperAI(height=height, width=width)
+    results = []
+    while len(ai.moves_made) < height * width - mines:
+        move = ai.make_safe_move()
+        if move is None:
+            move = ai.make_random_move()
+            if game.is_mine(move):
+                return results, False
+        nearby = game.nearby_mines(move)
+        done = measure()
+        ai.add_knowledge(move, nearby)
+        results.append(done())
+    return results, True
+
+
+def allocation():
+    """
+    Measures the most memory allocated at once during a call, beyond
+    what was in use before it.
+    """
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    return lambda: tracemalloc.get_traced_memory()[1] - before
+
+
+def main():
+    games = 3 if "--quick" in sys.argv else 10
+    print(f"{'board':<16}{'games':>6}{'won':>5}{'moves':>8}"
+          f"{'mean':>12}{'p99':>12}{'slowest':>12}{'total':>10}")
+    for height, width, mines in [(8, 8, 8), (16, 30, 99), (75, 75, 300)]:
+        times = []
+        won = 0
+        for seed in range(games):
+            game_times, game_won = play(height, width, mines, seed, timer)
+            times.extend(game_times)
+            won += game_won
+        times.sort()
+        p99 = times[int(len(times) * 0.99)]
+        print(f"{f'{width}x{height}, {mines}':<16}{games:>6}{won:>5}"
+              f"{len(times):>8}"
+              f"{statistics.mean(times) * 1000:>9.3f} ms"
+              f"{p99 * 1000:>9.3f} ms{times[-1] * 1000:>9.3f} ms"
+              f"{sum(times):>8.2f} s")
+
+    # allocation profile of one 75x75 game
+    tracemalloc.start()
+    start = time.perf_counter()
+    peaks, _ = play(75, 75, 300, 0, allocation)
+    seconds = time.perf_counter() - start
+    tracemalloc.stop()
+    print(f"75x75 allocations over {len(peaks)} moves: "
+          f"mean {statistics.mean(peaks) / 1024:.1f} KiB, "
+          f"largest {max(peaks) / 1024:.1f} KiB a move, "
+          f"total {sum(peaks) / 2 ** 20:.1f} MiB in {seconds:.1f} s traced")
+
+
+if __name__ == "__main__":
+    main()
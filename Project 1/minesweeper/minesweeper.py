@@ -1,6 +1,5 @@
 import itertools
 import random
-import copy
 
 
 class Minesweeper():
@@ -143,6 +142,64 @@ class Sentence():
             return False
 
 
+class Knowledge():
+    """
+    The sentences a MinesweeperAI knows, indexed by the cells in them
+    so that marking a cell or looking for related sentences only looks
+    at the sentences that mention the cells involved.
+    """
+
+    def __init__(self):
+        # Sentences by id, since they can't be hashed themselves
+        self.sentences = {}
+
+        # Ids of the sentences each cell appears in
+        self.containing = {}
+
+        # Sentences added or changed since update_knowledge last ran
+        self.changed = []
+
+    def __iter__(self):
+        return iter(list(self.sentences.values()))
+
+    def __len__(self):
+        return len(self.sentences)
+
+    def __contains__(self, sentence):
+        return id(sentence) in self.sentences
+
+    def add(self, sentence):
+        self.sentences[id(sentence)] = sentence
+        self.changed.append(sentence)
+        for cell in sentence.cells:
+            self.containing.setdefault(cell, set()).add(id(sentence))
+
+    def remove(self, sentence):
+        del self.sentences[id(sentence)]
+        for cell in sentence.cells:
+            self.containing[cell].discard(id(sentence))
+
+    def mark_mine(self, cell):
+        """Marks cell as a mine in every sentence that mentions it."""
+        for key in self.containing.pop(cell, ()):
+            self.sentences[key].mark_mine(cell)
+            self.changed.append(self.sentences[key])
+
+    def mark_safe(self, cell):
+        """Marks cell as safe in every sentence that mentions it."""
+        for key in self.containing.pop(cell, ()):
+            self.sentences[key].mark_safe(cell)
+            self.changed.append(self.sentences[key])
+
+    def sharing(self, sentence):
+        """Returns the other sentences with a cell in common with sentence."""
+        keys = set()
+        for cell in sentence.cells:
+            keys |= self.containing.get(cell, set())
+        keys.discard(id(sentence))
+        return [self.sentences[key] for key in keys]
+
+
 class MinesweeperAI():
     """
     Minesweeper game player
@@ -161,8 +218,8 @@ class MinesweeperAI():
         self.mines = set()
         self.safes = set()
 
-        # List of sentences about the game known to be true
-        self.knowledge = []
+        # Sentences about the game known to be true
+        self.knowledge = Knowledge()
 
     def mark_mine(self, cell):
         """
@@ -170,8 +227,7 @@ class MinesweeperAI():
         to mark that cell as a mine as well.
         """
         self.mines.add(cell)
-        for sentence in self.knowledge:
-            sentence.mark_mine(cell)
+        self.knowledge.mark_mine(cell)
 
     def mark_safe(self, cell):
         """
@@ -179,57 +235,55 @@ class MinesweeperAI():
         to mark that cell as safe as well.
         """
         self.safes.add(cell)
-        for sentence in self.knowledge:
-            sentence.mark_safe(cell)
+        self.knowledge.mark_safe(cell)
 
     def update_knowledge(self):
+        """
+        Draws every conclusion it can from the sentences that have
+        changed since it was last called, working through them one at a
+        time and adding any sentence that changes on the way, and
+        returns whether anything was concluded.
+        """
         did_we_update = False
-        found_safe = True
-        found_mine = True
-        while(found_safe or found_mine):
-            found_safe = False
-            found_mine = False
-            for item in self.knowledge:
-                safe_squares = copy.deepcopy(item.known_safes())
-                mine_squares = copy.deepcopy(item.known_mines())
-                if(safe_squares):
-                    did_we_update = True
-                    found_safe = True
-                    for square in safe_squares:
-                        self.safes.add(square)
-                        for fact in self.knowledge:
-                            fact.mark_safe(square)
+        changed = self.knowledge.changed
+        while(changed):
+            sentence = changed.pop()
+            if(sentence not in self.knowledge):
+                continue
 
-                if(mine_squares):
+            # removing null knowledge
+            if(sentence.isEmpty()):
+                self.knowledge.remove(sentence)
+                continue
+
+            # every cell is safe, or every cell is a mine
+            if(sentence.count == 0):
+                did_we_update = True
+                for square in list(sentence.cells):
+                    self.mark_safe(square)
+                continue
+            if(sentence.count == len(sentence.cells)):
+                did_we_update = True
+                for square in list(sentence.cells):
+                    self.mark_mine(square)
+                continue
+
+            # only sentences with a cell in common can be subsets of it
+            for other in self.knowledge.sharing(sentence):
+                if(other not in self.knowledge):
+                    continue
+                if(sentence.cells.issubset(other.cells)):
+                    # replace the superset with the cells it has left over
+                    self.knowledge.remove(other)
+                    self.knowledge.add(Sentence(other.cells - sentence.cells,
+                                                other.count - sentence.count))
                     did_we_update = True
-                    found_mine = True
-                    for square in mine_squares:
-                        self.mines.add(square)
-                        for fact in self.knowledge:
-                            fact.mark_mine(square)
-
-        # print(f"after first loop {did_we_update}")
-        knowledge_temp = copy.deepcopy(self.knowledge)
-        for i in knowledge_temp:
-            for j in knowledge_temp:
-                if(not i == j and i in self.knowledge and j in self.knowledge):
-                    if(i.cells.issubset(j.cells)):
-                        self.knowledge.append(Sentence(j.cells - i.cells,
-                                                       j.count - i.count))
-                        # remove the superset
-                        self.knowledge.remove(j)
-                        # mark the change
-                        did_we_update = True
-                        # print(f"in first check {i} and {j}")
-                    elif(j.cells.issubset(i.cells)):
-                        self.knowledge.append(Sentence(i.cells - j.cells,
-                                                       i.count - j.count))
-                        # remove the superset
-                        self.knowledge.remove(i)
-                        # mark the change
-                        did_we_update = True
-                        # print(f"in second check {i} and {j}")
-        # print(f"out with {did_we_update}")
+                elif(other.cells.issubset(sentence.cells)):
+                    self.knowledge.remove(sentence)
+                    self.knowledge.add(Sentence(sentence.cells - other.cells,
+                                                sentence.count - other.count))
+                    did_we_update = True
+                    break
         return did_we_update
 
     def add_knowledge(self, cell, count):
@@ -268,22 +322,12 @@ class MinesweeperAI():
                             new_sentence.count -= 1
                         else:
                             new_sentence.cells.add((i, j))
-        self.knowledge.append(new_sentence)
+        self.knowledge.add(new_sentence)
         # for item in self.knowledge:
         #     print(item)
 
-        # run update_knowledge until no more changes are being made
-        still_changing = True
-        while(still_changing):
-            still_changing = self.update_knowledge()
-
-            # removing null knowledge
-            non_null_knowledge = copy.deepcopy(self.knowledge)
-            for item in self.knowledge:
-                if item.isEmpty():
-                    non_null_knowledge.remove(item)
-                    # print("removing nulls")
-            self.knowledge = non_null_knowledge
+        # follow on from the new sentence until nothing more changes
+        self.update_knowledge()
 
         # print(f"Mines are {self.mines}")
 
@@ -324,4 +368,4 @@ class MinesweeperAI():
         return self.mines
 
     def get_knowledge(self):
-        return self.knowledge
+        return list(self.knowledge)